@@ -11,6 +11,7 @@ Data Sources (Priority Order):
 3. FDA Drug Labeling API (OpenFDA) - Contraindications, warnings, precautions, and documented interactions
 4. Web Search (SerpAPI) - Current interaction information and clinical evidence as supplement
 """
+import sys
 from typing import List, Dict, Optional
 from utils.drug_apis import DrugAPIClient, normalize_medications
 
@@ -63,7 +64,6 @@ class RetrievalAgent:
         # Step 1: Normalize medication names using RxNorm REST API
         # RxNorm is used ONLY for drug name normalization and RxCUI identifier resolution
         if medications:
-            import sys
             print(f"[DEBUG] Input medications: {medications}", file=sys.stderr)
             normalized = normalize_medications(medications, self.api_client)
             print(f"[DEBUG] Normalized medications: {normalized}", file=sys.stderr)
@@ -126,14 +126,16 @@ class RetrievalAgent:
                         for queried_drug in queried_drugs:
                             print(f"[DEBUG] Medication safety query - checking {queried_drug} against user's {len(user_medications)} current medications", file=sys.stderr)
                             
-                            # Check each user medication against the queried drug
-                            for user_med in user_medications:
-                                if user_med.lower() != queried_drug.lower():  # Don't check drug against itself
-                                    interactions = self.api_client.get_drug_interactions_drugbank([queried_drug, user_med])
-                                    if interactions:
-                                        print(f"[DEBUG] Found interactions between {queried_drug} and {user_med}", file=sys.stderr)
-                                        results["drug_interactions"].extend(interactions)
-                                        drugbank_found = True
+                            # Check the queried drug against all user medications in one lookup
+                            other_meds = [
+                                user_med for user_med in user_medications
+                                if user_med.lower() != queried_drug.lower()  # Don't check drug against itself
+                            ]
+                            interactions = self.api_client.get_drug_interactions_drugbank_against(queried_drug, other_meds)
+                            if interactions:
+                                print(f"[DEBUG] Found {len(interactions)} interactions between {queried_drug} and current medications", file=sys.stderr)
+                                results["drug_interactions"].extend(interactions)
+                                drugbank_found = True
                         
                         if drugbank_found:
                             results["metadata"]["sources_queried"].append("DrugBank (Current Medications Check)")
@@ -142,13 +144,15 @@ class RetrievalAgent:
                         queried_drug = normalized_names[0]
                         print(f"[DEBUG] Single medication safety query - checking {queried_drug} against user's {len(user_medications)} current medications", file=sys.stderr)
                         
-                        for user_med in user_medications:
-                            if user_med.lower() != queried_drug.lower():
-                                interactions = self.api_client.get_drug_interactions_drugbank([queried_drug, user_med])
-                                if interactions:
-                                    print(f"[DEBUG] Found interactions between {queried_drug} and {user_med}", file=sys.stderr)
-                                    results["drug_interactions"].extend(interactions)
-                                    drugbank_found = True
+                        other_meds = [
+                            user_med for user_med in user_medications
+                            if user_med.lower() != queried_drug.lower()
+                        ]
+                        interactions = self.api_client.get_drug_interactions_drugbank_against(queried_drug, other_meds)
+                        if interactions:
+                            print(f"[DEBUG] Found {len(interactions)} interactions between {queried_drug} and current medications", file=sys.stderr)
+                            results["drug_interactions"].extend(interactions)
+                            drugbank_found = True
                         
                         if drugbank_found:
                             results["metadata"]["sources_queried"].append("DrugBank (Current Medications Check)")
@@ -180,8 +184,9 @@ class RetrievalAgent:
             # Note: RxNorm interaction API endpoints have been deprecated by the NLM
             print(f"[DEBUG] Querying FDA for additional medication information", file=sys.stderr)
             fda_queried = False
+            fda_by_name = self.api_client.get_fda_drug_info_bulk(medications)
             for med_name in medications:
-                fda_info = self.api_client.get_fda_drug_info(med_name)
+                fda_info = fda_by_name.get(med_name)
                 if fda_info:
                     results["fda_info"].append(fda_info)
                     results["citations"].append({
@@ -199,7 +204,6 @@ class RetrievalAgent:
             # This is a secondary source to supplement DrugBank and FDA data
             # FILTERING: Only search for drug-drug interactions if that's what user asked about
             if len(medications) > 1 and query_focus in ("drug_drug", "general"):
-                import sys
                 print(f"[DEBUG] Supplementing with web search for drug interactions", file=sys.stderr)
                 interaction_search_query = f"{medications[0]} {medications[1]} drug interaction"
                 if len(medications) > 2:
@@ -212,7 +216,6 @@ class RetrievalAgent:
                     results["metadata"]["sources_queried"].append("Web Search (Supplementary)")
             elif query_focus == "medication_safety":
                 # For medication_safety queries, search for interactions with all user medications
-                import sys
                 user_medications = query_plan.get("user_context", {}).get("medications", [])
                 
                 # Determine which medications were explicitly queried vs from user's profile
@@ -223,28 +226,32 @@ class RetrievalAgent:
                 ]
                 
                 if user_medications and queried_drugs:
+                    pairs = []
                     for queried_drug in queried_drugs:
                         print(f"[DEBUG] Searching web for {queried_drug} interactions with user's medications", file=sys.stderr)
-                        for user_med in user_medications:
-                            if user_med.lower() != queried_drug.lower():
-                                search_query = f"{queried_drug} {user_med} interaction safety"
-                                web_results = self.api_client.search_drug_websites(search_query)
-                                if web_results:
-                                    print(f"[DEBUG] Found web results for {queried_drug} + {user_med}", file=sys.stderr)
-                                    results["web_sources"].extend(web_results)
+                        pairs.extend(
+                            (queried_drug, user_med) for user_med in user_medications
+                            if user_med.lower() != queried_drug.lower()
+                        )
+                    
+                    # Run the pair searches concurrently; results keep the pair order
+                    search_queries = [f"{queried_drug} {user_med} interaction safety" for queried_drug, user_med in pairs]
+                    for (queried_drug, user_med), web_results in zip(pairs, self.api_client.search_drug_websites_many(search_queries)):
+                        if web_results:
+                            print(f"[DEBUG] Found web results for {queried_drug} + {user_med}", file=sys.stderr)
+                            results["web_sources"].extend(web_results)
                     if results["web_sources"]:
                         results["metadata"]["sources_queried"].append("Web Search (Current Med Interactions)")
                 elif user_medications and len(medications) == 1:
                     # Fallback: single medication from normalized list
                     queried_drug = medications[0]
                     print(f"[DEBUG] Searching web for {queried_drug} interactions with user's medications", file=sys.stderr)
-                    for user_med in user_medications:
-                        if user_med.lower() != queried_drug.lower():
-                            search_query = f"{queried_drug} {user_med} interaction safety"
-                            web_results = self.api_client.search_drug_websites(search_query)
-                            if web_results:
-                                print(f"[DEBUG] Found web results for {queried_drug} + {user_med}", file=sys.stderr)
-                                results["web_sources"].extend(web_results)
+                    other_meds = [user_med for user_med in user_medications if user_med.lower() != queried_drug.lower()]
+                    search_queries = [f"{queried_drug} {user_med} interaction safety" for user_med in other_meds]
+                    for user_med, web_results in zip(other_meds, self.api_client.search_drug_websites_many(search_queries)):
+                        if web_results:
+                            print(f"[DEBUG] Found web results for {queried_drug} + {user_med}", file=sys.stderr)
+                            results["web_sources"].extend(web_results)
                     if results["web_sources"]:
                         results["metadata"]["sources_queried"].append("Web Search (Current Med Interactions)")
                 else:
@@ -253,13 +260,12 @@ class RetrievalAgent:
             # Step 4: Additional web RAG search for additional context (general medication info)
             # For medication_safety queries, still search for general drug info and safety
             web_queried = False
-            for med_name in medications:
-                if query_focus == "medication_safety":
-                    # For safety checks, search for safety and contraindication info
-                    safety_search_query = f"{med_name} safety contraindications warnings"
-                    web_results = self.api_client.search_drug_websites(safety_search_query)
-                else:
-                    web_results = self.api_client.search_drug_websites(med_name)
+            if query_focus == "medication_safety":
+                # For safety checks, search for safety and contraindication info
+                search_queries = [f"{med_name} safety contraindications warnings" for med_name in medications]
+            else:
+                search_queries = list(medications)
+            for web_results in self.api_client.search_drug_websites_many(search_queries):
                 if web_results:
                     results["web_sources"].extend(web_results)
                     web_queried = True
@@ -16,6 +16,8 @@ class Config:
     
     # RxNorm API Configuration (Public REST API - No authentication required)
     RXNORM_BASE_URL = 'https://rxnav.nlm.nih.gov/REST'
+    RXNORM_MAX_CONCURRENCY = 5  # Maximum RxNorm requests in flight at once
+    RXNORM_REQUESTS_PER_SECOND = 20  # NLM's published per-IP limit for RxNav
     
     # DrugBank API Configuration
     DRUGBANK_USERNAME = os.environ.get('DRUGBANK_USERNAME')
@@ -24,10 +26,33 @@ class Config:
     
     # SerpAPI Configuration (for web search RAG)
     SERPAPI_KEY = os.environ.get('SERPAPI_KEY')
+    WEB_SEARCH_MAX_CONCURRENCY = 4  # Parallel SerpAPI searches per query
     
     # FDA API Configuration
     FDA_API_BASE_URL = os.environ.get('FDA_API_BASE_URL', 'https://api.fda.gov')
     
+    # HTTP Client Settings
+    # Open connections to RxNorm/FDA in the background when DrugAPIClient is created
+    PREWARM_CONNECTIONS = os.environ.get('PREWARM_CONNECTIONS', 'true').lower() == 'true'
+    
+    # Local cache files live together under one directory
+    CACHE_DIR = os.environ.get('CACHE_DIR', '.cache')
+    
+    # Drug names RxNorm could not match are remembered on disk so they are not re-queried
+    RXNORM_NEGATIVE_CACHE_PATH = os.environ.get(
+        'RXNORM_NEGATIVE_CACHE_PATH', os.path.join(CACHE_DIR, 'rxnorm_neg.db')
+    )
+    RXNORM_NEGATIVE_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days
+    
+    # FDA label responses are stored with their ETag/Last-Modified for conditional re-fetching
+    FDA_HTTP_CACHE_PATH = os.environ.get('FDA_HTTP_CACHE_PATH', os.path.join(CACHE_DIR, 'fda_cache.db'))
+    FDA_HTTP_CACHE_TTL = 24 * 60 * 60  # 1 day
+    FDA_HTTP_CACHE_MAX_ENTRIES = 500
+    
+    # Stop calling an API after this many consecutive failures, retry after the timeout
+    CIRCUIT_BREAKER_FAIL_MAX = 5
+    CIRCUIT_BREAKER_RESET_TIMEOUT = 60  # seconds
+    
     # Application Settings
     MAX_QUERY_LENGTH = 500
     MAX_MEDICATIONS_PER_QUERY = 10
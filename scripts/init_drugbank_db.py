@@ -7,8 +7,12 @@ Run this once to initialize the database, then it will be reused.
 
 Usage:
     python scripts/init_drugbank_db.py
+
+Installing lxml (pip install lxml) makes the XML parsing several times
+faster; without it the standard library parser is used.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -54,7 +58,8 @@ def main():
     db = DrugBankDatabase(str(db_file), str(xml_file))
     
     try:
-        success = db.initialize()
+        # Parse the XML in one process per CPU
+        success = db.initialize(workers=os.cpu_count() or 1)
         if success:
             print()
             print(f"SUCCESS: Database created successfully!")
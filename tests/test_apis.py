@@ -1,10 +1,380 @@
 """
 Tests for API utilities.
 """
-# Placeholder for API tests
-# TODO: Add unit tests for drug_apis module
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from urllib.parse import parse_qs, urlparse
+from config import Config
+from utils.drug_apis import DrugAPIClient, _RxNormRetry, _rxnorm_limiter, iter_normalized_medications, normalize_medications
+from utils.cache_manager import CacheManager
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from utils.rate_limiter import RateLimiter
+
+
+class FakeRxNormClient:
+    """Stands in for DrugAPIClient without touching the network."""
+    
+    def __init__(self, known):
+        self.known = known
+    
+    def normalize_drug_name_rxnorm(self, drug_name):
+        rxcui = self.known.get(drug_name)
+        if rxcui is None:
+            return None
+        return {
+            "rxcui": rxcui,
+            "name": drug_name,
+            "original_name": drug_name,
+            "normalized_name": drug_name,
+            "source": "RxNorm"
+        }
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+    
+    def __init__(self, payload, status_code=200, headers=None):
+        self.content = json.dumps(payload).encode()
+        self.status_code = status_code
+        self.headers = headers or {}
+    
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Records outbound GETs and answers every one with the same payload."""
+    
+    def __init__(self, payload=None):
+        self.payload = payload or {}
+        self.calls = []
+    
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return FakeResponse(self.payload)
+
+
+@pytest.fixture
+def offline_client(tmp_path, monkeypatch):
+    """DrugAPIClient with no network access and a throwaway negative cache."""
+    monkeypatch.setattr(Config, "PREWARM_CONNECTIONS", False)
+    monkeypatch.setattr(Config, "RXNORM_NEGATIVE_CACHE_PATH", str(tmp_path / "neg.db"))
+    monkeypatch.setattr(Config, "FDA_HTTP_CACHE_PATH", str(tmp_path / "fda.db"))
+    client = DrugAPIClient()
+    client.session = FakeSession()
+    # The process-wide breakers would carry failures over between tests
+    client._rxnorm_breaker = CircuitBreaker("RxNorm", fail_max=5, reset_timeout=60)
+    client._fda_breaker = CircuitBreaker("FDA", fail_max=5, reset_timeout=60)
+    return client
+
 
 def test_placeholder():
     """Placeholder test."""
     assert True
 
+
+def test_normalize_medications_falls_back_to_original_name():
+    """Unknown medications keep their original name."""
+    client = FakeRxNormClient({"aspirin": "1191"})
+    
+    normalized = normalize_medications(["aspirin", "madeupdrug"], client)
+    
+    assert normalized[0]["rxcui"] == "1191"
+    assert normalized[1] == {
+        "original_name": "madeupdrug",
+        "normalized_name": "madeupdrug",
+        "source": "fallback"
+    }
+
+
+def test_iter_normalized_medications_yields_every_medication():
+    """The streaming variant yields one result per input medication."""
+    client = FakeRxNormClient({"aspirin": "1191", "warfarin": "11289"})
+    
+    results = list(iter_normalized_medications(["aspirin", "warfarin"], client))
+    
+    assert sorted(r["original_name"] for r in results) == ["aspirin", "warfarin"]
+
+
+def test_unmatched_name_is_not_requeried(offline_client):
+    """A name RxNorm cannot match is served from the negative cache next time."""
+    assert offline_client.normalize_drug_name_rxnorm("notarealdrug") is None
+    calls_after_first_lookup = len(offline_client.session.calls)
+    assert calls_after_first_lookup > 0
+    
+    assert offline_client.normalize_drug_name_rxnorm("NotARealDrug ") is None
+    assert len(offline_client.session.calls) == calls_after_first_lookup
+
+
+class FakeDrugBankDB:
+    """In-memory DrugBank stand-in that counts interaction-matrix lookups."""
+    
+    def __init__(self, drugs, interactions):
+        self.drugs = drugs
+        self.interactions = interactions
+        self.matrix_calls = 0
+    
+    def get_drug_by_name_fuzzy(self, drug_name):
+        drug_id = self.drugs.get(drug_name.lower())
+        return {"id": drug_id, "name": drug_name} if drug_id else None
+    
+    def get_interaction_matrix(self, drug_ids):
+        self.matrix_calls += 1
+        return [
+            row for row in self.interactions
+            if row["drug_id"] in drug_ids and row["interacting_drug_id"] in drug_ids
+        ]
+
+
+def test_interactions_against_current_meds_use_one_lookup(offline_client):
+    """Checking a drug against several current meds runs one matrix query and keeps only its pairs."""
+    offline_client.drugbank_db = FakeDrugBankDB(
+        {"warfarin": "DB00682", "ibuprofen": "DB01050", "lisinopril": "DB00722"},
+        [
+            {"drug_id": "DB00682", "interacting_drug_id": "DB01050",
+             "interacting_drug_name": "Ibuprofen", "description": "Bleeding risk"},
+            {"drug_id": "DB01050", "interacting_drug_id": "DB00722",
+             "interacting_drug_name": "Lisinopril", "description": "Reduced effect"},
+        ]
+    )
+    
+    interactions = offline_client.get_drug_interactions_drugbank_against(
+        "warfarin", ["ibuprofen", "lisinopril"]
+    )
+    
+    assert offline_client.drugbank_db.matrix_calls == 1
+    assert [i["drug2_name"] for i in interactions] == ["Ibuprofen"]
+
+
+def test_brand_and_generic_of_same_drug_skip_matrix_lookup(offline_client):
+    """Names that resolve to one DrugBank entry cannot interact, so no matrix query runs."""
+    offline_client.drugbank_db = FakeDrugBankDB({"ibuprofen": "DB01050"}, [])
+    
+    assert offline_client.get_drug_interactions_drugbank(["Advil", "ibuprofen"]) == []
+    assert offline_client.get_drug_interactions_drugbank(["ibuprofen"]) == []
+    assert offline_client.drugbank_db.matrix_calls == 0
+
+
+def test_rate_limiter_spaces_calls_after_burst():
+    """Calls beyond the burst size wait for tokens to refill."""
+    limiter = RateLimiter(rate=50, burst=2)
+    
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+    
+    # Two calls come from the initial burst, the other two wait ~20ms each
+    assert elapsed >= 0.035
+
+
+def test_rxnorm_retries_take_rate_limit_tokens(monkeypatch):
+    """Transport-level RxNorm retries draw on the shared token bucket."""
+    acquired = []
+    monkeypatch.setattr(_rxnorm_limiter, "acquire", lambda: acquired.append(1))
+    
+    retry = _RxNormRetry(total=3, backoff_factor=0)
+    retry.increment(method="GET", url="/rxcui.json").sleep()
+    
+    assert acquired == [1]
+
+
+def test_rxnorm_budget_is_shared_between_clients(offline_client):
+    """A second client does not get a fresh rate budget."""
+    assert DrugAPIClient()._rxnorm_limiter is offline_client._rxnorm_limiter
+
+
+def test_circuit_breakers_are_shared_between_clients(offline_client):
+    """An outage seen by one client opens the breaker for all of them."""
+    first, second = DrugAPIClient(), DrugAPIClient()
+    assert first._rxnorm_breaker is second._rxnorm_breaker
+    assert first._fda_breaker is second._fda_breaker
+
+
+def test_circuit_breaker_opens_after_repeated_failures():
+    """Once open, the breaker rejects calls without running them."""
+    breaker = CircuitBreaker("test", fail_max=2, reset_timeout=60)
+    calls = []
+    
+    def failing():
+        calls.append(1)
+        raise ConnectionError("down")
+    
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+    
+    with pytest.raises(CircuitBreakerError):
+        breaker.call(failing)
+    assert len(calls) == 2
+
+
+def test_circuit_breaker_closes_after_successful_trial():
+    """A successful call after the reset timeout closes the breaker."""
+    breaker = CircuitBreaker("test", fail_max=1, reset_timeout=0)
+    
+    def failing():
+        raise ConnectionError("down")
+    
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == CircuitBreaker.OPEN
+    
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_fda_bulk_lookup_uses_one_request(offline_client):
+    """Labels for several drugs come back from a single OR'd search."""
+    offline_client.session = FakeSession({"results": [
+        {"openfda": {"brand_name": ["Zyrtecbulk"], "generic_name": ["cetirizine"]}, "warnings": ["w1"]},
+        {"openfda": {"brand_name": ["Claritinbulk"], "generic_name": ["loratadine"]}, "warnings": ["w2"]},
+    ]})
+    
+    found = offline_client.get_fda_drug_info_bulk(["Zyrtecbulk", "Claritinbulk"])
+    
+    assert len(offline_client.session.calls) == 1
+    assert found["Zyrtecbulk"]["warnings"] == ["w1"]
+    assert found["Claritinbulk"]["generic_name"] == "loratadine"
+
+
+class LabelSearchSession(FakeSession):
+    """Answers openFDA label searches from a fixed, relevance-ordered label list."""
+    
+    LABELS = [
+        {"openfda": {"brand_name": ["Metformin Hydrochloride"], "generic_name": ["METFORMIN HYDROCHLORIDE"]}, "warnings": ["m1"]},
+        {"openfda": {"brand_name": ["Glucophage"], "generic_name": ["METFORMIN HYDROCHLORIDE"]}, "warnings": ["m2"]},
+        {"openfda": {"brand_name": ["Zyrtecparity"], "generic_name": ["CETIRIZINE HYDROCHLORIDE"]}, "warnings": ["z1"]},
+    ]
+    
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        query = parse_qs(urlparse(url).query)
+        names = {name.lower() for name in re.findall(r'"([^"]*)"', query["search"][0])}
+        hits = [
+            label for label in self.LABELS
+            if any(
+                f" {name} " in f" {value.lower()} "
+                for name in names
+                for values in label["openfda"].values()
+                for value in values
+            )
+        ]
+        limit = int(query["limit"][0])
+        return FakeResponse({"meta": {"results": {"total": len(hits)}}, "results": hits[:limit]})
+
+
+def test_fda_bulk_lookup_matches_single_lookup(offline_client):
+    """The bulk search picks the same labels as single lookups and settles every name in one request."""
+    names = ["metformin", "Zyrtecparity", "Nolabelparity"]
+    offline_client.session = LabelSearchSession()
+    
+    found = offline_client.get_fda_drug_info_bulk(names)
+    
+    assert len(offline_client.session.calls) == 1
+    assert found["metformin"]["warnings"] == ["m1"]
+    assert found["Zyrtecparity"]["warnings"] == ["z1"]
+    assert "Nolabelparity" not in found
+    
+    # A name the complete response did not match is remembered as having no label
+    assert offline_client.get_fda_drug_info("Nolabelparity") is None
+    assert len(offline_client.session.calls) == 1
+    
+    offline_client.cache.clear_cache("drug")
+    for name in names:
+        assert offline_client.get_fda_drug_info(name) == found.get(name)
+    assert len(offline_client.session.calls) == 1 + len(names)
+
+
+class RevalidatingSession:
+    """Serves a label with an ETag, then answers 304 when the ETag is sent back."""
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.sent_headers = []
+    
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(headers or {})
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return FakeResponse({}, status_code=304)
+        return FakeResponse(self.payload, headers={"ETag": '"v1"'})
+
+
+def test_fda_label_is_revalidated_with_etag(offline_client):
+    """A stored label is reused when FDA answers 304 Not Modified."""
+    payload = {"results": [{"openfda": {"brand_name": ["Etagdrug"]}, "warnings": ["w"]}]}
+    offline_client.session = RevalidatingSession(payload)
+    
+    first = offline_client.get_fda_drug_info("Etagdrug")
+    offline_client.cache.clear_cache("drug")
+    second = offline_client.get_fda_drug_info("Etagdrug")
+    
+    assert offline_client.session.sent_headers[1] == {"If-None-Match": '"v1"'}
+    assert second == first
+
+
+def test_fda_response_store_is_pruned(offline_client, monkeypatch):
+    """Stored FDA responses expire and are capped in number."""
+    monkeypatch.setattr(Config, "FDA_HTTP_CACHE_MAX_ENTRIES", 2)
+    offline_client.session = RevalidatingSession({"results": []})
+    
+    for i in range(3):
+        offline_client._fda_get(f"https://api.fda.gov/drug/label.json?search={i}", timeout=5)
+    
+    stored = offline_client._http_cache.execute("SELECT COUNT(*) FROM fda_responses").fetchone()[0]
+    assert stored == 2
+    
+    monkeypatch.setattr(Config, "FDA_HTTP_CACHE_TTL", -1)
+    offline_client._fda_get("https://api.fda.gov/drug/label.json?search=0", timeout=5)
+    
+    # An expired entry is fetched again without validators
+    assert offline_client.session.sent_headers[-1] == {}
+
+
+class NotFoundSession(FakeSession):
+    """Answers every GET the way openFDA answers a search with no matches."""
+    
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return FakeResponse({"error": {"code": "NOT_FOUND"}}, status_code=404)
+
+
+def test_fda_not_found_is_cached_as_no_label(offline_client):
+    """A 404 from openFDA means no label, not a failure to retry on the next call."""
+    offline_client.session = NotFoundSession()
+    
+    assert offline_client.get_fda_drug_info("Nolabeldrug") is None
+    assert offline_client.get_fda_drug_info("Nolabeldrug") is None
+    assert len(offline_client.session.calls) == 1
+
+
+def test_expired_drug_entry_read_from_many_threads():
+    """Concurrent lookups of the same expired drug entry all miss without raising."""
+    cache = CacheManager(cache_dir=None)
+    cache.cache_drug_data("Warfarin", {"rxcui": "11289"})
+    cache._drug_cache["warfarin"]["timestamp"] -= cache.DRUG_TTL + 1
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cache.get_cached_drug_data, ["Warfarin"] * 64))
+    
+    assert results == [None] * 64
+    assert cache.cache_stats["drug_misses"] == 64
+
+
+def test_drug_cache_is_case_insensitive_bounded_and_copied(monkeypatch):
+    """Spellings share an entry, hits are private copies, and old entries are evicted."""
+    monkeypatch.setattr(CacheManager, "DRUG_CACHE_MAX_ENTRIES", 2)
+    cache = CacheManager(cache_dir=None)
+    cache.cache_drug_data("fda:Aspirin", {"warnings": ["bleeding"]})
+    
+    hit = cache.get_cached_drug_data(" fda:aspirin ")
+    hit["warnings"].append("mutated")
+    assert cache.get_cached_drug_data("FDA:ASPIRIN") == {"warnings": ["bleeding"]}
+    
+    cache.cache_drug_data("fda:ibuprofen", {})
+    cache.cache_drug_data("fda:naproxen", {})
+    assert cache.get_cached_drug_data("fda:aspirin") is None
+    assert cache.get_cached_drug_data("fda:naproxen") == {}
@@ -4,7 +4,9 @@ Tests for DrugBank integration (RAG approach)
 
 import pytest
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from config import Config
 from utils.drugbank_loader import DrugBankLoader
 from utils.drugbank_db import DrugBankDatabase
 from utils.drug_apis import DrugAPIClient
@@ -132,9 +134,106 @@ class TestDrugBankDatabase:
         db.close()
 
 
+SAMPLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<drugbank xmlns="http://www.drugbank.ca">
+  <drug type="small molecule">
+    <drugbank-id primary="true">DB00682</drugbank-id>
+    <name>Warfarin</name>
+    <description>Anticoagulant.</description>
+    <drug-interactions>
+      <drug-interaction>
+        <drugbank-id>DB01050</drugbank-id>
+        <name>Ibuprofen</name>
+        <description>Increased risk of bleeding.</description>
+      </drug-interaction>
+    </drug-interactions>
+    <food-interactions>
+      <food-interaction>Avoid large amounts of vitamin K.</food-interaction>
+    </food-interactions>
+  </drug>
+  <drug type="small molecule">
+    <drugbank-id primary="true">DB01050</drugbank-id>
+    <name>Ibuprofen</name>
+    <drug-interactions>
+      <drug-interaction>
+        <drugbank-id>DB00682</drugbank-id>
+        <name>Warfarin</name>
+        <description>Increased risk of bleeding.</description>
+      </drug-interaction>
+    </drug-interactions>
+  </drug>
+  <drug type="small molecule">
+    <drugbank-id primary="true">DB00945</drugbank-id>
+    <name>Acetylsalicylic acid</name>
+  </drug>
+</drugbank>
+"""
+
+
+class TestSampleDrugBankDatabase:
+    """Test the database against a small generated DrugBank XML file."""
+    
+    @pytest.fixture
+    def xml_file(self, tmp_path):
+        """SAMPLE_XML written to disk."""
+        xml_file = tmp_path / "sample.xml"
+        xml_file.write_text(SAMPLE_XML)
+        return xml_file
+    
+    @pytest.fixture
+    def db(self, tmp_path, xml_file):
+        """Database built from SAMPLE_XML."""
+        db = DrugBankDatabase(str(tmp_path / "sample.db"), str(xml_file))
+        assert db.initialize()
+        yield db
+        db.close()
+    
+    def test_parallel_parse_matches_serial(self, xml_file, monkeypatch):
+        """Sharded multi-process parsing yields the same drugs in the same order."""
+        monkeypatch.setattr(DrugBankLoader, "DRUGS_PER_SHARD", 1)
+        loader = DrugBankLoader(str(xml_file))
+        
+        assert len(loader._find_shards()) == 3
+        assert list(loader.iter_drugs(workers=2)) == list(loader.iter_drugs())
+    
+    def test_drugs_and_interactions_loaded(self, db):
+        """Every drug, interaction and food interaction is stored."""
+        assert db.get_drug_by_name("warfarin")["id"] == "DB00682"
+        assert len(db.get_drug_interactions("DB00682")) == 1
+        assert db.get_food_interactions("DB00682") == ["Avoid large amounts of vitamin K."]
+    
+    def test_fuzzy_name_lookup(self, db):
+        """Prefix, later-word and synonym matches resolve; wildcards are literal."""
+        assert db.get_drug_by_name_fuzzy("WARF")["id"] == "DB00682"
+        assert db.get_drug_by_name_fuzzy("acid")["id"] == "DB00945"
+        assert db.get_drug_by_name_fuzzy("aspirin")["id"] == "DB00945"
+        assert db.get_drug_by_name_fuzzy("%") is None
+    
+    def test_lookups_from_other_threads(self, db):
+        """Pooled connections can serve queries from request threads."""
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            names = list(pool.map(lambda _: db.search_drugs("a")[0]["name"], range(8)))
+        
+        assert len(names) == 8
+    
+    def test_interaction_matrix(self, db):
+        """Each interacting pair is reported once."""
+        matrix = db.get_interaction_matrix(["DB00682", "DB01050", "DB00945"])
+        
+        assert len(matrix) == 1
+        assert {matrix[0]["drug_id"], matrix[0]["interacting_drug_id"]} == {"DB00682", "DB01050"}
+
+
 class TestDrugAPIClient:
     """Test integrated DrugAPIClient with DrugBank."""
     
+    @pytest.fixture(autouse=True)
+    def local_caches(self, tmp_path, monkeypatch):
+        """Keep the client's cache files out of the working tree and skip connection prewarming."""
+        monkeypatch.setattr(Config, "PREWARM_CONNECTIONS", False)
+        monkeypatch.setattr(Config, "RXNORM_NEGATIVE_CACHE_PATH", str(tmp_path / "rxnorm_neg.db"))
+        monkeypatch.setattr(Config, "FDA_HTTP_CACHE_PATH", str(tmp_path / "fda_cache.db"))
+    
     def test_client_initialization(self):
         """Test that API client initializes."""
         client = DrugAPIClient()
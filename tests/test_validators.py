@@ -0,0 +1,38 @@
+"""
+Tests for input validation utilities.
+"""
+from utils.validators import validate_user_query, validate_user_context
+
+
+def test_query_validation():
+    """Empty and oversized queries are rejected, others accepted."""
+    assert validate_user_query("Can I take ibuprofen with warfarin?") == (True, None)
+    assert validate_user_query("   ") == (False, "Query cannot be empty")
+    assert validate_user_query("") == (False, "Query cannot be empty")
+    assert validate_user_query("x" * 501) == (False, "Query exceeds maximum length of 500 characters")
+    assert validate_user_query("x" * 20, max_length=10) == (False, "Query exceeds maximum length of 10 characters")
+
+
+def test_context_validation():
+    """Out-of-range and mistyped context fields are rejected."""
+    assert validate_user_context({}) == (True, None)
+    assert validate_user_context({"age": 40, "weight": "70.5", "medications": []}) == (True, None)
+    assert validate_user_context({"age": 200}) == (False, "Age must be between 0 and 150")
+    assert validate_user_context({"age": "old"}) == (False, "Age must be a valid number")
+    assert validate_user_context({"height": 350}) == (False, "Height must be between 0 and 300 cm")
+    assert validate_user_context({"conditions": "asthma"}) == (False, "Conditions must be a list")
+
+
+def test_list_fields_accept_tuples():
+    """Medications and conditions may be given as tuples, but not as other types."""
+    assert validate_user_context({"medications": ("warfarin",), "conditions": ()}) == (True, None)
+    assert validate_user_context({"medications": None}) == (False, "Medications must be a list")
+    assert validate_user_context({"conditions": {"asthma"}}) == (False, "Conditions must be a list")
+
+
+def test_non_finite_measurements_are_rejected():
+    """NaN and infinity never pass as a weight or height."""
+    assert validate_user_context({"weight": float("nan")}) == (False, "Weight must be between 0 and 1000")
+    assert validate_user_context({"weight": "nan"}) == (False, "Weight must be between 0 and 1000")
+    assert validate_user_context({"height": float("inf")}) == (False, "Height must be between 0 and 300 cm")
+    assert validate_user_context({"age": float("nan")}) == (False, "Age must be a valid number")
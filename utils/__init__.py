@@ -3,17 +3,19 @@ Utility modules for the medication interaction tracker.
 
 Includes:
 - cache_manager: Three-level intelligent caching system
+- circuit_breaker: Fail-fast protection for outbound API calls
 - drug_apis: API clients for RxNorm, DrugBank, FDA, SerpAPI
 - drugbank_db: DrugBank SQLite database interface
 - session_manager: User session and context management
 - validators: Input validation utilities
 - openai_client: Shared OpenAI client initialization
+- rate_limiter: Token-bucket rate limiting for outbound API calls
 """
 
 from .cache_manager import get_cache_manager
 from .session_manager import get_default_user_context, merge_user_context
 from .validators import validate_user_query, validate_user_context
-from .drug_apis import DrugAPIClient, normalize_medications
+from .drug_apis import DrugAPIClient, iter_normalized_medications, normalize_medications
 from .openai_client import initialize_openai_client, cleanup_environment
 
 __all__ = [
@@ -23,6 +25,7 @@ __all__ = [
     'validate_user_query',
     'validate_user_context',
     'DrugAPIClient',
+    'iter_normalized_medications',
     'normalize_medications',
     'initialize_openai_client',
     'cleanup_environment',
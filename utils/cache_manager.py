@@ -17,16 +17,25 @@ Strategy:
    - Saves: ~2-3 seconds per hit
 """
 
+import copy
 import hashlib
 import json
+import logging
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import os
 
+logger = logging.getLogger(__name__)
+
 class CacheManager:
     """Multi-level caching system for reducing API calls and improving speed."""
     
+    # Drug lookups are keyed on user-supplied names, so that cache is bounded (LRU)
+    DRUG_CACHE_MAX_ENTRIES = 4096
+    
     def __init__(self, cache_dir: str = '.cache'):
         """
         Initialize cache manager with optional persistent storage.
@@ -37,6 +46,9 @@ class CacheManager:
         """
         self.cache_dir = cache_dir
         self.in_memory_cache = {}  # Fast in-memory storage
+        self._drug_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Lookups run on RxNorm/FDA worker threads, so reads, expiry and writes are locked
+        self._lock = threading.Lock()
         self.cache_stats = {
             'query_hits': 0,
             'query_misses': 0,
@@ -76,7 +88,7 @@ class CacheManager:
                 context_parts.append(f"sex:{user_context['sex']}")
             if user_context.get('conditions'):
                 conditions = user_context.get('conditions', [])
-                if isinstance(conditions, list) and conditions:
+                if isinstance(conditions, (list, tuple)) and conditions:
                     context_parts.append(f"cond:{','.join(sorted(conditions))}")
             if context_parts:
                 context_key = "|" + "|".join(context_parts)
@@ -104,17 +116,17 @@ class CacheManager:
         """
         cache_key = f"query:{self._hash_query(query, user_context)}"
         
-        if cache_key in self.in_memory_cache:
-            cached = self.in_memory_cache[cache_key]
-            if self._is_cache_valid(cached['timestamp'], self.QUERY_TTL):
-                self.cache_stats['query_hits'] += 1
-                print(f"[CACHE HIT] Query cache - saved OpenAI call")
-                return cached['data']
-            else:
+        with self._lock:
+            cached = self.in_memory_cache.get(cache_key)
+            if cached is not None:
+                if self._is_cache_valid(cached['timestamp'], self.QUERY_TTL):
+                    self.cache_stats['query_hits'] += 1
+                    print(f"[CACHE HIT] Query cache - saved OpenAI call")
+                    return cached['data']
                 # Expired, remove it
                 del self.in_memory_cache[cache_key]
-        
-        self.cache_stats['query_misses'] += 1
+            
+            self.cache_stats['query_misses'] += 1
         return None
     
     def cache_explanation(self, query: str, explanation: Dict[str, Any], user_context: Dict = None) -> None:
@@ -127,10 +139,11 @@ class CacheManager:
             user_context: User's health context (age, sex, conditions) to differentiate cache keys
         """
         cache_key = f"query:{self._hash_query(query, user_context)}"
-        self.in_memory_cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': explanation
-        }
+        with self._lock:
+            self.in_memory_cache[cache_key] = {
+                'timestamp': time.time(),
+                'data': explanation
+            }
         print(f"[CACHE STORE] Query explanation cached")
     
     # ============ DRUG CACHE (Individual Drug Lookups) ============
@@ -142,28 +155,39 @@ class CacheManager:
         Returns:
             Cached drug data if valid, None otherwise
         """
-        cache_key = f"drug:{drug_name.lower().strip()}"
+        cache_key = drug_name.strip().lower()
         
-        if cache_key in self.in_memory_cache:
-            cached = self.in_memory_cache[cache_key]
-            if self._is_cache_valid(cached['timestamp'], self.DRUG_TTL):
-                self.cache_stats['drug_hits'] += 1
-                print(f"[CACHE HIT] Drug cache for '{drug_name}' - faster lookup")
-                return cached['data']
-            else:
-                del self.in_memory_cache[cache_key]
+        with self._lock:
+            cached = self._drug_cache.get(cache_key)
+            if cached is not None:
+                if self._is_cache_valid(cached['timestamp'], self.DRUG_TTL):
+                    self._drug_cache.move_to_end(cache_key)
+                    self.cache_stats['drug_hits'] += 1
+                    data = cached['data']
+                else:
+                    del self._drug_cache[cache_key]
+                    cached = None
+            if cached is None:
+                self.cache_stats['drug_misses'] += 1
+                return None
         
-        self.cache_stats['drug_misses'] += 1
-        return None
+        logger.debug("Drug cache hit for %s", drug_name)
+        # Callers get their own copy, so mutating a result cannot corrupt the cache
+        return copy.deepcopy(data)
     
     def cache_drug_data(self, drug_name: str, drug_data: Dict[str, Any]) -> None:
         """Cache data for a single drug (normalization, ID, etc)."""
-        cache_key = f"drug:{drug_name.lower().strip()}"
-        self.in_memory_cache[cache_key] = {
+        cache_key = drug_name.strip().lower()
+        entry = {
             'timestamp': time.time(),
-            'data': drug_data
+            'data': copy.deepcopy(drug_data)
         }
-        print(f"[CACHE STORE] Drug '{drug_name}' cached for future queries")
+        with self._lock:
+            self._drug_cache[cache_key] = entry
+            self._drug_cache.move_to_end(cache_key)
+            while len(self._drug_cache) > self.DRUG_CACHE_MAX_ENTRIES:
+                self._drug_cache.popitem(last=False)
+        logger.debug("Drug %s cached for future queries", drug_name)
     
     # ============ INTERACTION CACHE (Drug Pair Results) ============
     
@@ -176,26 +200,27 @@ class CacheManager:
         """
         cache_key = f"interaction:{self._hash_drugs(drug1, drug2)}"
         
-        if cache_key in self.in_memory_cache:
-            cached = self.in_memory_cache[cache_key]
-            if self._is_cache_valid(cached['timestamp'], self.INTERACTION_TTL):
-                self.cache_stats['interaction_hits'] += 1
-                print(f"[CACHE HIT] Interaction cache for '{drug1}' + '{drug2}' - saved API calls")
-                return cached['data']
-            else:
+        with self._lock:
+            cached = self.in_memory_cache.get(cache_key)
+            if cached is not None:
+                if self._is_cache_valid(cached['timestamp'], self.INTERACTION_TTL):
+                    self.cache_stats['interaction_hits'] += 1
+                    print(f"[CACHE HIT] Interaction cache for '{drug1}' + '{drug2}' - saved API calls")
+                    return cached['data']
                 del self.in_memory_cache[cache_key]
-        
-        self.cache_stats['interaction_misses'] += 1
+            
+            self.cache_stats['interaction_misses'] += 1
         return None
     
     def cache_interaction(self, drug1: str, drug2: str, 
                          interaction_data: Dict[str, Any]) -> None:
         """Cache interaction data for a drug pair."""
         cache_key = f"interaction:{self._hash_drugs(drug1, drug2)}"
-        self.in_memory_cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': interaction_data
-        }
+        with self._lock:
+            self.in_memory_cache[cache_key] = {
+                'timestamp': time.time(),
+                'data': interaction_data
+            }
         print(f"[CACHE STORE] Interaction data cached for '{drug1}' + '{drug2}'")
     
     # ============ UTILITY METHODS ============
@@ -212,14 +237,21 @@ class CacheManager:
             cache_type: 'query', 'drug', 'interaction', or None for all
         """
         if cache_type is None:
-            self.in_memory_cache.clear()
+            with self._lock:
+                self.in_memory_cache.clear()
+                self._drug_cache.clear()
             print("[CACHE] All caches cleared")
         else:
             prefix = f"{cache_type}:"
-            keys_to_delete = [k for k in self.in_memory_cache.keys() 
-                             if k.startswith(prefix)]
-            for key in keys_to_delete:
-                del self.in_memory_cache[key]
+            with self._lock:
+                if cache_type == 'drug':
+                    keys_to_delete = list(self._drug_cache)
+                    self._drug_cache.clear()
+                else:
+                    keys_to_delete = [k for k in self.in_memory_cache.keys() 
+                                     if k.startswith(prefix)]
+                    for key in keys_to_delete:
+                        del self.in_memory_cache[key]
             print(f"[CACHE] {cache_type} cache cleared ({len(keys_to_delete)} entries)")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -246,7 +278,7 @@ class CacheManager:
                 'hit_rate': f"{(self.cache_stats['interaction_hits'] / total_interactions * 100):.1f}%" if total_interactions > 0 else "N/A",
                 'time_savings_estimate': f"~{self.cache_stats['interaction_hits'] * 2}s saved"
             },
-            'total_entries': len(self.in_memory_cache),
+            'total_entries': len(self.in_memory_cache) + len(self._drug_cache),
             'timestamp': datetime.now().isoformat()
         }
 
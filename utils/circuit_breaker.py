@@ -0,0 +1,78 @@
+"""
+Circuit breaker for outbound API calls.
+
+After `fail_max` consecutive failures the breaker opens and calls fail
+immediately instead of waiting on timeouts. Once `reset_timeout` seconds have
+passed a single trial call is let through (half-open): success closes the
+breaker again, failure re-opens it.
+"""
+import threading
+import time
+from typing import Any, Callable
+
+
+class CircuitBreakerError(Exception):
+    """Raised when a call is rejected because the breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe CLOSED -> OPEN -> HALF_OPEN circuit breaker."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 60):
+        """
+        Initialize a closed breaker.
+        
+        Args:
+            name: Name of the protected service (used in error messages)
+            fail_max: Consecutive failures before the breaker opens
+            reset_timeout: Seconds to stay open before allowing a trial call
+        """
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func through the breaker.
+        
+        Raises:
+            CircuitBreakerError: If the breaker is open (or a trial call is already running)
+            Exception: Whatever func raises; the failure is counted first
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitBreakerError(f"{self.name} circuit is open")
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                # Only one trial call at a time
+                raise CircuitBreakerError(f"{self.name} circuit is half-open")
+        
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._record_failure()
+            raise
+        
+        self._record_success()
+        return result
+    
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.fail_max:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+    
+    def _record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
@@ -7,17 +7,159 @@ RxNorm's /interaction/ endpoints (referenced in older NIH documentation) have be
 and are no longer available. Drug interaction data is retrieved from DrugBank database (RAG approach),
 FDA drug labels (OpenFDA), and web search results instead.
 """
+import json
+import logging
+import os
+import re
 import requests
+import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import sqlite3
+import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Dict, Optional, Tuple
+from urllib.parse import quote_plus
 from pathlib import Path
 from config import Config
+from .cache_manager import get_cache_manager
+from .circuit_breaker import CircuitBreaker, CircuitBreakerError
 from .drugbank_db import DrugBankDatabase
+from .rate_limiter import RateLimiter
+
+# SerpAPI client is optional - web search is skipped without it
+try:
+    from serpapi import GoogleSearch
+except ImportError:
+    GoogleSearch = None
+
+# orjson parses the large RxNorm/FDA payloads several times faster; fall back to the stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+def _drug_cache_key(kind: str, name: str) -> str:
+    """Drug cache key for a lookup kind and a user-supplied name or id."""
+    return f"{kind}:{name.strip().lower()}"
+
+
+# Words of a drug name, roughly as openFDA's analyzer splits them
+_NAME_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# RxNorm limits are per process, not per client: every DrugAPIClient (and
+# every retry of a request) draws on the same concurrency and rate budget
+_rxnorm_semaphore = threading.BoundedSemaphore(Config.RXNORM_MAX_CONCURRENCY)
+_rxnorm_limiter = RateLimiter(Config.RXNORM_REQUESTS_PER_SECOND, burst=Config.RXNORM_MAX_CONCURRENCY)
+
+
+# An outage is seen by the whole process, so the breakers are shared the same way
+_rxnorm_breaker = CircuitBreaker("RxNorm", Config.CIRCUIT_BREAKER_FAIL_MAX, Config.CIRCUIT_BREAKER_RESET_TIMEOUT)
+_fda_breaker = CircuitBreaker("FDA", Config.CIRCUIT_BREAKER_FAIL_MAX, Config.CIRCUIT_BREAKER_RESET_TIMEOUT)
+
+class _RxNormRetry(Retry):
+    """Retry policy that takes a RxNorm rate-limit token before each re-sent request."""
+    
+    def sleep(self, response=None):
+        super().sleep(response)
+        _rxnorm_limiter.acquire()
+
+
+def _build_session() -> requests.Session:
+    """
+    Create the pooled HTTP session used for all outbound API calls.
+    
+    Keep-alive connections are reused across calls (and across the
+    normalization worker threads), and transient failures - connection
+    errors, 429 and 5xx responses - are retried with jittered exponential
+    backoff.
+    
+    Returns:
+        Configured requests.Session
+    """
+    # Only transient failures are retried; any other 4xx (e.g. a malformed
+    # query) comes straight back to the caller
+    retry_options = dict(
+        total=3,
+        backoff_factor=0.3,
+        backoff_jitter=0.2,
+        backoff_max=5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "HEAD"}),
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(**retry_options))
+    # RxNorm retries happen below _rxnorm_get, so they take their rate-limit tokens here
+    rxnorm_adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=Config.RXNORM_MAX_CONCURRENCY,
+        max_retries=_RxNormRetry(**retry_options),
+    )
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount(Config.RXNORM_BASE_URL, rxnorm_adapter)
+    return session
+
+
+def _prewarm_connections(session: requests.Session):
+    """
+    Open connections to the external APIs in the background.
+    
+    The first request to each host pays for DNS, TCP and TLS setup. Sending a
+    HEAD request from a daemon thread at startup puts an established connection
+    in the session's pool before the first real query needs it. Failures are
+    ignored - the real request will simply open its own connection.
+    """
+    def warm(url: str):
+        try:
+            session.head(url, timeout=5)
+        except requests.RequestException:
+            pass
+    
+    for url in (Config.RXNORM_BASE_URL, Config.FDA_API_BASE_URL):
+        threading.Thread(target=warm, args=(url,), daemon=True).start()
+
+
+# Global HTTP session (singleton pattern) - every DrugAPIClient shares one
+# connection pool, so DNS/TLS setup and prewarming happen once per process
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Get or create the global pooled HTTP session."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = _build_session()
+            if Config.PREWARM_CONNECTIONS:
+                _prewarm_connections(_http_session)
+    return _http_session
 
 
 class DrugAPIClient:
     """Client for interacting with drug databases."""
     
+    # Labels requested by one combined openFDA search in get_fda_drug_info_bulk
+    FDA_BULK_LIMIT = 100
+    
+    # Common brand name to generic name mappings for fallback DrugBank lookup
+    BRAND_TO_GENERIC = {
+        "advil": "ibuprofen",
+        "motrin": "ibuprofen",
+        "tylenol": "acetaminophen",
+        "paracetamol": "acetaminophen",
+        "aspirin": "acetylsalicylic acid",
+        "bayer": "acetylsalicylic acid",
+        "levora": "levonorgestrel",
+        "nexplanon": "etonogestrel",
+        "valtrex": "valacyclovir",
+        "zovirax": "acyclovir",
+    }
+    
     def __init__(self):
         """Initialize API clients."""
         self.rxnorm_base_url = Config.RXNORM_BASE_URL
@@ -25,9 +167,207 @@ class DrugAPIClient:
         self.drugbank_password = Config.DRUGBANK_PASSWORD
         self.fda_base_url = Config.FDA_API_BASE_URL
         
+        # Endpoint URLs are fixed per instance, so build them once
+        self._rxnorm_rxcui_url = f"{self.rxnorm_base_url}/rxcui.json"
+        self._rxnorm_approx_url = f"{self.rxnorm_base_url}/approximateTerm.json"
+        
+        # FDA label search URL up to the search clause; only the clause is encoded per call
+        self._fda_label_url = f"{self.fda_base_url}/drug/label.json"
+        self._fda_search_prefix = f"{self._fda_label_url}?limit=1&search="
+        
+        # Process-wide HTTP session so connections are reused across requests and clients
+        self.session = get_http_session()
+        
+        # Bound RxNorm traffic: limited requests in flight, limited requests per second,
+        # shared by every client in the process
+        self._rxnorm_semaphore = _rxnorm_semaphore
+        self._rxnorm_limiter = _rxnorm_limiter
+        
+        # Fail fast instead of waiting on timeouts while an API is down
+        self._rxnorm_breaker = _rxnorm_breaker
+        self._fda_breaker = _fda_breaker
+        
+        # Shared drug cache for RxNorm normalizations and FDA labels
+        self.cache = get_cache_manager()
+        
+        # Persistent record of names RxNorm could not match
+        self._neg_cache_lock = threading.Lock()
+        self._neg_cache = self._open_sqlite_cache(
+            Config.RXNORM_NEGATIVE_CACHE_PATH,
+            "CREATE TABLE IF NOT EXISTS misses (name TEXT PRIMARY KEY, ts INTEGER)"
+        )
+        
+        # Persistent ETag/Last-Modified validators and bodies of FDA label responses
+        self._http_cache_lock = threading.Lock()
+        self._http_cache = self._open_sqlite_cache(
+            Config.FDA_HTTP_CACHE_PATH,
+            "CREATE TABLE IF NOT EXISTS fda_responses "
+            "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, ts INTEGER)"
+        )
+        
         # Initialize DrugBank database
         self.drugbank_db = self._initialize_drugbank_db()
     
+    def _rxnorm_get(self, url: str, params: Dict) -> requests.Response:
+        """
+        Issue a GET to RxNorm, staying within the configured concurrency and rate limits.
+        
+        Raises:
+            CircuitBreakerError: If RxNorm has been failing and the breaker is open
+        """
+        with self._rxnorm_semaphore:
+            self._rxnorm_limiter.acquire()
+            return self._rxnorm_breaker.call(self.session.get, url, params=params, timeout=10)
+    
+    def _open_sqlite_cache(self, path: str, create_sql: str) -> Optional[sqlite3.Connection]:
+        """
+        Open (and create if needed) a small local SQLite cache file.
+        
+        Args:
+            path: Cache file path
+            create_sql: CREATE TABLE IF NOT EXISTS statement for the cache table
+        
+        Returns:
+            SQLite connection or None if the cache file cannot be opened
+            (e.g. read-only filesystem on Vercel)
+        """
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute(create_sql)
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARNING] Local cache {path} unavailable ({e}), continuing without it", file=sys.stderr)
+            return None
+    
+    def _fda_get(self, url: str, timeout: int) -> bytes:
+        """
+        GET an FDA label URL, revalidating any stored copy with a conditional request.
+        
+        If an earlier response carried an ETag or Last-Modified header, it is
+        sent back as If-None-Match / If-Modified-Since, and a 304 Not Modified
+        reply is answered from the stored body without downloading the label.
+        
+        Args:
+            url: Full FDA request URL
+            timeout: Request timeout in seconds
+        
+        Returns:
+            Response body bytes
+        
+        Raises:
+            CircuitBreakerError: If FDA has been failing and the breaker is open
+            requests.RequestException: On network errors or error status codes
+        """
+        stored = None
+        if self._http_cache is not None:
+            cutoff = int(time.time()) - Config.FDA_HTTP_CACHE_TTL
+            try:
+                with self._http_cache_lock:
+                    stored = self._http_cache.execute(
+                        "SELECT etag, last_modified, body FROM fda_responses WHERE url = ? AND ts > ?",
+                        (url, cutoff)
+                    ).fetchone()
+            except sqlite3.Error:
+                stored = None
+        
+        headers = {}
+        if stored:
+            etag, last_modified, _ = stored
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        response = self._fda_breaker.call(self.session.get, url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and stored:
+            logger.debug("FDA label not modified, using stored copy: %s", url)
+            self._touch_http_cache(url)
+            return stored[2]
+        if response.status_code == 404:
+            # openFDA answers a search with no matches with 404, not an empty result list
+            return b'{"results": []}'
+        response.raise_for_status()
+        
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self._http_cache is not None and (etag or last_modified):
+            self._store_http_cache(url, etag, last_modified, response.content)
+        
+        return response.content
+    
+    def _touch_http_cache(self, url: str):
+        """Restart the expiry of a stored FDA response that was just revalidated."""
+        try:
+            with self._http_cache_lock:
+                self._http_cache.execute(
+                    "UPDATE fda_responses SET ts = ? WHERE url = ?", (int(time.time()), url)
+                )
+                self._http_cache.commit()
+        except sqlite3.Error:
+            pass
+    
+    def _store_http_cache(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        """
+        Store an FDA response with its validators, then prune the store.
+        
+        Bulk label URLs differ for every combination of medications, so rows
+        older than FDA_HTTP_CACHE_TTL are dropped and only the newest
+        FDA_HTTP_CACHE_MAX_ENTRIES are kept.
+        """
+        now = int(time.time())
+        try:
+            with self._http_cache_lock:
+                self._http_cache.execute(
+                    "INSERT OR REPLACE INTO fda_responses (url, etag, last_modified, body, ts) VALUES (?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, body, now)
+                )
+                self._http_cache.execute(
+                    "DELETE FROM fda_responses WHERE ts <= ?", (now - Config.FDA_HTTP_CACHE_TTL,)
+                )
+                self._http_cache.execute(
+                    "DELETE FROM fda_responses WHERE url NOT IN "
+                    "(SELECT url FROM fda_responses ORDER BY ts DESC LIMIT ?)",
+                    (Config.FDA_HTTP_CACHE_MAX_ENTRIES,)
+                )
+                self._http_cache.commit()
+        except sqlite3.Error:
+            pass
+    
+    def _is_known_miss(self, drug_name: str) -> bool:
+        """Check whether RxNorm recently failed to match this drug name."""
+        if self._neg_cache is None:
+            return False
+        
+        cutoff = int(time.time()) - Config.RXNORM_NEGATIVE_CACHE_TTL
+        try:
+            with self._neg_cache_lock:
+                row = self._neg_cache.execute(
+                    "SELECT 1 FROM misses WHERE name = ? AND ts > ?",
+                    (drug_name.strip().lower(), cutoff)
+                ).fetchone()
+            return row is not None
+        except sqlite3.Error:
+            return False
+    
+    def _record_miss(self, drug_name: str):
+        """Remember that RxNorm has no match for this drug name."""
+        if self._neg_cache is None:
+            return
+        
+        try:
+            with self._neg_cache_lock:
+                self._neg_cache.execute(
+                    "INSERT OR REPLACE INTO misses (name, ts) VALUES (?, ?)",
+                    (drug_name.strip().lower(), int(time.time()))
+                )
+                self._neg_cache.commit()
+        except sqlite3.Error:
+            pass
+    
     def _initialize_drugbank_db(self) -> Optional[DrugBankDatabase]:
         """
         Initialize DrugBank database connection.
@@ -35,7 +375,6 @@ class DrugAPIClient:
         Returns:
             DrugBankDatabase instance or None if initialization fails
         """
-        import sys
         try:
             # Paths for database and XML file
             base_path = Path(__file__).parent.parent
@@ -80,30 +419,37 @@ class DrugAPIClient:
         Returns:
             Dictionary with normalized drug information or None
         """
-        import sys
+        cached = self.cache.get_cached_drug_data(_drug_cache_key("rxnorm", drug_name))
+        if cached is not None:
+            # Entries are shared across spellings ("Aspirin", "aspirin")
+            cached["original_name"] = drug_name
+            return cached
+        
+        # Skip the network entirely for names RxNorm is known not to match
+        if self._is_known_miss(drug_name):
+            logger.debug("Skipping RxNorm lookup for known unmatched name: %s", drug_name)
+            return None
+        
         try:
             # Try exact match first using RxNorm's public API
-            url = f"{self.rxnorm_base_url}/rxcui.json"
+            url = self._rxnorm_rxcui_url
             params = {"name": drug_name}
             
-            print(f"[DEBUG] RxNorm exact match request: {url} with params {params}", file=sys.stderr)
-            response = requests.get(url, params=params, timeout=10)
+            logger.debug("RxNorm exact match request: %s with params %s", url, params)
+            response = self._rxnorm_get(url, params)
             response.raise_for_status()
-            data = response.json()
-            print(f"[DEBUG] RxNorm exact match response: {data}", file=sys.stderr)
+            data = json_loads(response.content)
+            logger.debug("RxNorm exact match response: %s", data)
             
-            # If exact match found
-            if data.get("idGroup") and data["idGroup"].get("rxnormId"):
+            try:
                 rxcui = data["idGroup"]["rxnormId"][0]
-                
+            except (KeyError, TypeError, IndexError):
+                rxcui = None
+            
+            # If exact match found
+            if rxcui:
                 # Get the drug name from RxCUI
-                name_url = f"{self.rxnorm_base_url}/rxcui/{rxcui}/property.json"
-                name_response = requests.get(name_url, params={"propName": "RxNorm Name"}, timeout=10)
-                name_data = name_response.json()
-                
-                drug_name_normalized = drug_name
-                if name_data.get("propConceptGroup") and name_data["propConceptGroup"].get("propConcept"):
-                    drug_name_normalized = name_data["propConceptGroup"]["propConcept"][0].get("propValue", drug_name)
+                drug_name_normalized = self._get_rxnorm_name(rxcui) or drug_name
                 
                 result = {
                     "rxcui": rxcui,
@@ -112,25 +458,27 @@ class DrugAPIClient:
                     "normalized_name": drug_name_normalized,
                     "source": "RxNorm"
                 }
-                print(f"[DEBUG] Exact match found for {drug_name}: {result}", file=sys.stderr)
+                logger.debug("Exact match found for %s: %s", drug_name, result)
+                self.cache.cache_drug_data(_drug_cache_key("rxnorm", drug_name), result)
                 return result
             
             # If no exact match, try approximate match
-            print(f"[DEBUG] No exact match for {drug_name}, trying approximate match", file=sys.stderr)
-            approx_url = f"{self.rxnorm_base_url}/approximateTerm.json"
+            logger.debug("No exact match for %s, trying approximate match", drug_name)
+            approx_url = self._rxnorm_approx_url
             approx_params = {"term": drug_name, "maxEntries": 1}
             
-            print(f"[DEBUG] RxNorm approx match request: {approx_url} with params {approx_params}", file=sys.stderr)
-            approx_response = requests.get(approx_url, params=approx_params, timeout=10)
+            logger.debug("RxNorm approx match request: %s with params %s", approx_url, approx_params)
+            approx_response = self._rxnorm_get(approx_url, approx_params)
             approx_response.raise_for_status()
-            approx_data = approx_response.json()
-            print(f"[DEBUG] RxNorm approx match response: {approx_data}", file=sys.stderr)
+            approx_data = json_loads(approx_response.content)
+            logger.debug("RxNorm approx match response: %s", approx_data)
             
-            if (approx_data.get("approximateGroup") and 
-                approx_data["approximateGroup"].get("candidate") and 
-                len(approx_data["approximateGroup"]["candidate"]) > 0):
-                
+            try:
                 candidate = approx_data["approximateGroup"]["candidate"][0]
+            except (KeyError, TypeError, IndexError):
+                candidate = None
+            
+            if candidate:
                 result = {
                     "rxcui": candidate.get("rxcui"),
                     "name": candidate.get("name", drug_name),
@@ -140,16 +488,50 @@ class DrugAPIClient:
                     "score": candidate.get("score"),
                     "rank": candidate.get("rank")
                 }
-                print(f"[DEBUG] Approximate match found for {drug_name}: {result}", file=sys.stderr)
+                logger.debug("Approximate match found for %s: %s", drug_name, result)
+                self.cache.cache_drug_data(_drug_cache_key("rxnorm", drug_name), result)
                 return result
             
-            print(f"[DEBUG] No match found for {drug_name}", file=sys.stderr)
+            logger.debug("No match found for %s", drug_name)
+            self._record_miss(drug_name)
             return None
             
-        except Exception as e:
-            print(f"[DEBUG] Error normalizing drug name {drug_name}: {str(e)}", file=sys.stderr)
+        except CircuitBreakerError as e:
+            logger.debug("Skipping RxNorm lookup for %s: %s", drug_name, e)
+            return None
+        except (requests.RequestException, ValueError) as e:
+            logger.debug("Error normalizing drug name %s: %s", drug_name, e)
             return None
     
+    def _get_rxnorm_name(self, rxcui: str) -> Optional[str]:
+        """
+        Get the RxNorm name for an RxCUI.
+        
+        A concept's name never changes, so it is cached by RxCUI: different
+        spellings that resolve to the same concept only pay for one lookup.
+        
+        Args:
+            rxcui: RxNorm concept identifier
+        
+        Returns:
+            RxNorm name or None if it could not be retrieved
+        """
+        cached = self.cache.get_cached_drug_data(_drug_cache_key("rxcui", rxcui))
+        if cached is not None:
+            return cached["name"]
+        
+        name_url = f"{self.rxnorm_base_url}/rxcui/{rxcui}/property.json"
+        name_response = self._rxnorm_get(name_url, {"propName": "RxNorm Name"})
+        name_data = json_loads(name_response.content)
+        
+        try:
+            name = name_data["propConceptGroup"]["propConcept"][0]["propValue"]
+        except (KeyError, TypeError, IndexError):
+            return None
+        
+        self.cache.cache_drug_data(_drug_cache_key("rxcui", rxcui), {"name": name})
+        return name
+    
     def get_drug_interactions_rxnorm(self, rxcui_list: List[str]) -> List[Dict]:
         """
         DEPRECATED: RxNorm interaction API endpoints are no longer available.
@@ -173,14 +555,57 @@ class DrugAPIClient:
         Returns:
             Empty list (RxNorm interaction API is not available)
         """
-        import sys
         # Log that this endpoint is deprecated
-        print(f"[DEBUG] get_drug_interactions_rxnorm called - this method is deprecated", file=sys.stderr)
-        print(f"[DEBUG] RxNorm interaction API endpoints are no longer available", file=sys.stderr)
-        print(f"[DEBUG] Use FDA drug labels and web search for interaction data instead", file=sys.stderr)
+        logger.debug("get_drug_interactions_rxnorm called - this method is deprecated")
+        logger.debug("RxNorm interaction API endpoints are no longer available")
+        logger.debug("Use FDA drug labels and web search for interaction data instead")
         
         return []  # Return empty list since the API is deprecated
     
+    def _find_drugbank_drug(self, drug_name: str) -> Optional[Dict]:
+        """
+        Look up a drug in the DrugBank database, retrying with the generic name for known brands.
+        
+        Args:
+            drug_name: Normalized drug name
+        
+        Returns:
+            DrugBank drug dictionary or None
+        """
+        # Try exact match first, then fuzzy match as fallback
+        drug = self.drugbank_db.get_drug_by_name_fuzzy(drug_name)
+        if drug:
+            logger.debug("Found DrugBank entry for %s: %s (name in DB: %s)", drug_name, drug['id'], drug['name'])
+            return drug
+        
+        # Try generic name if brand name didn't work
+        generic_name = self.BRAND_TO_GENERIC.get(drug_name.lower())
+        if not generic_name:
+            logger.debug("No DrugBank entry found for %s (tried exact and partial match)", drug_name)
+            return None
+        
+        logger.debug("Trying generic name %s for brand name %s", generic_name, drug_name)
+        drug = self.drugbank_db.get_drug_by_name_fuzzy(generic_name)
+        if drug:
+            logger.debug("Found DrugBank entry for %s: %s (name in DB: %s)", generic_name, drug['id'], drug['name'])
+        else:
+            logger.debug("No DrugBank entry found for %s or generic %s", drug_name, generic_name)
+        return drug
+    
+    def _format_drugbank_interactions(self, db_interactions: List[Dict]) -> List[Dict]:
+        """Convert interaction rows from the DrugBank database into the API result schema."""
+        return [
+            {
+                "drug1_id": interaction["drug_id"],
+                "drug2_id": interaction["interacting_drug_id"],
+                "drug2_name": interaction["interacting_drug_name"],
+                "description": interaction["description"],
+                "source": "DrugBank",
+                "confidence": "high"
+            }
+            for interaction in db_interactions
+        ]
+    
     def get_drug_interactions_drugbank(self, drug_names: List[str]) -> List[Dict]:
         """
         Get drug interactions from DrugBank database (RAG approach).
@@ -194,75 +619,90 @@ class DrugAPIClient:
         Returns:
             List of interaction dictionaries
         """
-        import sys
-        
         if not self.drugbank_db:
             print(f"[WARNING] DrugBank database not initialized", file=sys.stderr)
             return []
         
-        interactions = []
-        
-        # Common brand name to generic name mappings for fallback lookup
-        BRAND_TO_GENERIC = {
-            "advil": "ibuprofen",
-            "motrin": "ibuprofen",
-            "tylenol": "acetaminophen",
-            "paracetamol": "acetaminophen",
-            "aspirin": "acetylsalicylic acid",
-            "bayer": "acetylsalicylic acid",
-            "levora": "levonorgestrel",
-            "nexplanon": "etonogestrel",
-            "valtrex": "valacyclovir",
-            "zovirax": "acyclovir",
-        }
+        # An interaction needs two drugs; skip the name lookups entirely otherwise
+        if len(drug_names) < 2:
+            return []
         
         try:
             # Look up each drug in the database
             drug_ids = []
             for drug_name in drug_names:
-                # Try exact match first, then fuzzy match as fallback
-                drug = self.drugbank_db.get_drug_by_name_fuzzy(drug_name)
+                drug = self._find_drugbank_drug(drug_name)
                 if drug:
                     drug_ids.append(drug["id"])
-                    print(f"[DEBUG] Found DrugBank entry for {drug_name}: {drug['id']} (name in DB: {drug['name']})", file=sys.stderr)
-                else:
-                    # Try generic name if brand name didn't work
-                    generic_name = BRAND_TO_GENERIC.get(drug_name.lower())
-                    if generic_name:
-                        print(f"[DEBUG] Trying generic name {generic_name} for brand name {drug_name}", file=sys.stderr)
-                        drug = self.drugbank_db.get_drug_by_name_fuzzy(generic_name)
-                        if drug:
-                            drug_ids.append(drug["id"])
-                            print(f"[DEBUG] Found DrugBank entry for {generic_name}: {drug['id']} (name in DB: {drug['name']})", file=sys.stderr)
-                        else:
-                            print(f"[DEBUG] No DrugBank entry found for {drug_name} or generic {generic_name}", file=sys.stderr)
-                    else:
-                        print(f"[DEBUG] No DrugBank entry found for {drug_name} (tried exact and partial match)", file=sys.stderr)
             
             if not drug_ids:
                 print(f"[WARNING] No drugs found in DrugBank database", file=sys.stderr)
                 return []
             
+            # A brand and its generic resolve to the same entry; pair each drug only once
+            drug_ids = list(dict.fromkeys(drug_ids))
+            if len(drug_ids) < 2:
+                return []
+            
             # Get interaction matrix for all drug combinations
             db_interactions = self.drugbank_db.get_interaction_matrix(drug_ids)
+            interactions = self._format_drugbank_interactions(db_interactions)
             
-            for interaction in db_interactions:
-                interactions.append({
-                    "drug1_id": interaction["drug_id"],
-                    "drug2_id": interaction["interacting_drug_id"],
-                    "drug2_name": interaction["interacting_drug_name"],
-                    "description": interaction["description"],
-                    "source": "DrugBank",
-                    "confidence": "high"
-                })
-            
-            print(f"[DEBUG] Found {len(interactions)} interactions from DrugBank", file=sys.stderr)
+            logger.debug("Found %s interactions from DrugBank", len(interactions))
             return interactions
             
         except Exception as e:
             print(f"[ERROR] Error getting DrugBank interactions: {str(e)}", file=sys.stderr)
             return []
     
+    def get_drug_interactions_drugbank_against(self, drug_name: str, other_drug_names: List[str]) -> List[Dict]:
+        """
+        Get DrugBank interactions between one drug and each of a list of other drugs.
+        
+        Resolves every name once and runs a single interaction-matrix lookup
+        instead of one lookup per pair. Interactions among the other drugs
+        themselves are not returned.
+        
+        Args:
+            drug_name: Drug being checked (e.g. a newly queried medication)
+            other_drug_names: Drugs to check it against (e.g. the user's current medications)
+        
+        Returns:
+            List of interaction dictionaries involving drug_name
+        """
+        if not self.drugbank_db:
+            print(f"[WARNING] DrugBank database not initialized", file=sys.stderr)
+            return []
+        
+        try:
+            drug = self._find_drugbank_drug(drug_name)
+            if not drug:
+                return []
+            
+            drug_id = drug["id"]
+            drug_ids = [drug_id]
+            for other_name in other_drug_names:
+                other = self._find_drugbank_drug(other_name)
+                if other and other["id"] != drug_id:
+                    drug_ids.append(other["id"])
+            
+            if len(drug_ids) < 2:
+                return []
+            
+            db_interactions = [
+                interaction
+                for interaction in self.drugbank_db.get_interaction_matrix(drug_ids)
+                if drug_id in (interaction["drug_id"], interaction["interacting_drug_id"])
+            ]
+            interactions = self._format_drugbank_interactions(db_interactions)
+            
+            logger.debug("Found %s DrugBank interactions for %s", len(interactions), drug_name)
+            return interactions
+            
+        except Exception as e:
+            print(f"[ERROR] Error getting DrugBank interactions for {drug_name}: {str(e)}", file=sys.stderr)
+            return []
+    
     def get_drug_details_drugbank(self, drug_name: str) -> Optional[Dict]:
         """
         Get detailed drug information from DrugBank database.
@@ -273,15 +713,13 @@ class DrugAPIClient:
         Returns:
             Dictionary with drug details or None
         """
-        import sys
-        
         if not self.drugbank_db:
             return None
         
         try:
             drug = self.drugbank_db.get_drug_by_name(drug_name)
             if drug:
-                print(f"[DEBUG] Retrieved DrugBank details for {drug_name}", file=sys.stderr)
+                logger.debug("Retrieved DrugBank details for %s", drug_name)
                 return drug
             return None
             
@@ -300,8 +738,6 @@ class DrugAPIClient:
         Returns:
             List of food interaction descriptions
         """
-        import sys
-        
         if not self.drugbank_db:
             return []
         
@@ -309,12 +745,12 @@ class DrugAPIClient:
             # Try exact match first, then fuzzy match as fallback
             drug = self.drugbank_db.get_drug_by_name_fuzzy(drug_name)
             if not drug:
-                print(f"[DEBUG] No DrugBank entry found for food interactions: {drug_name}", file=sys.stderr)
+                logger.debug("No DrugBank entry found for food interactions: %s", drug_name)
                 return []
             
             interactions = self.drugbank_db.get_food_interactions(drug["id"])
             if interactions:
-                print(f"[DEBUG] Found {len(interactions)} food interactions for {drug_name} (matched to: {drug['name']})", file=sys.stderr)
+                logger.debug("Found %s food interactions for %s (matched to: %s)", len(interactions), drug_name, drug['name'])
             return interactions
             
         except Exception as e:
@@ -331,20 +767,89 @@ class DrugAPIClient:
         Returns:
             List of matching drug dictionaries
         """
-        import sys
-        
         if not self.drugbank_db:
             return []
         
         try:
             results = self.drugbank_db.search_drugs(search_term)
-            print(f"[DEBUG] DrugBank search for '{search_term}' returned {len(results)} results", file=sys.stderr)
+            logger.debug("DrugBank search for '%s' returned %s results", search_term, len(results))
             return results
             
         except Exception as e:
             print(f"[ERROR] Error searching DrugBank: {str(e)}", file=sys.stderr)
             return []
     
+    def _build_fda_info(self, drug_name: str, result: Dict) -> Dict:
+        """
+        Extract the interaction-relevant sections of an FDA label result.
+        
+        Args:
+            drug_name: Drug name the label was looked up for
+            result: One entry of the openFDA label "results" list
+        
+        Returns:
+            Dictionary with FDA drug information
+        """
+        openfda = result.get("openfda", {})
+        
+        # Safely extract brand_name - handle missing keys and empty lists
+        try:
+            brand_name = openfda["brand_name"][0]
+        except (KeyError, TypeError, IndexError):
+            brand_name = drug_name
+        
+        # Safely extract generic_name - handle missing keys and empty lists
+        try:
+            generic_name = openfda["generic_name"][0]
+        except (KeyError, TypeError, IndexError):
+            generic_name = ""
+        
+        # Extract key sections that contain interaction/contraindication info
+        contraindications = result.get("contraindications_and_usage", [])
+        warnings = result.get("warnings", [])
+        precautions = result.get("precautions", [])
+        drug_interactions_section = result.get("drug_interactions", [])
+        
+        logger.debug("FDA info retrieved for %s: has warnings=%s, interactions=%s", drug_name, len(warnings), len(drug_interactions_section))
+        return {
+            "drug_name": drug_name,
+            "brand_name": brand_name,
+            "generic_name": generic_name,
+            "warnings": warnings,
+            "contraindications": contraindications,
+            "precautions": precautions,
+            "drug_interactions": drug_interactions_section,
+            "source": "FDA"
+        }
+    
+    @staticmethod
+    def _fda_search_clause(drug_name: str) -> str:
+        """openFDA search clause matching a drug name as a phrase in brand or generic names."""
+        # A stray double quote would break the query
+        name = drug_name.replace('"', '')
+        return f'(openfda.brand_name:"{name}" OR openfda.generic_name:"{name}")'
+    
+    @staticmethod
+    def _label_matches(name_tokens: List[str], result: Dict) -> bool:
+        """
+        Check whether a label would be hit by _fda_search_clause for a name.
+        
+        Mirrors the phrase search locally: the name's words must appear, in
+        order, in one of the label's brand or generic names, so "metformin"
+        matches "Metformin Hydrochloride".
+        """
+        if not name_tokens:
+            return False
+        
+        n = len(name_tokens)
+        openfda = result.get("openfda", {})
+        for field in ("brand_name", "generic_name"):
+            for value in openfda.get(field, []):
+                words = _NAME_TOKEN_RE.findall(value.lower())
+                if any(words[i:i + n] == name_tokens for i in range(len(words) - n + 1)):
+                    return True
+        return False
+    
     def get_fda_drug_info(self, drug_name: str) -> Optional[Dict]:
         """
         Get drug information from FDA API including contraindications and warnings.
@@ -355,59 +860,110 @@ class DrugAPIClient:
         Returns:
             Dictionary with FDA drug information or None
         """
-        import sys
+        # An empty dict marks a drug known to have no FDA label
+        cached = self.cache.get_cached_drug_data(_drug_cache_key("fda", drug_name))
+        if cached is not None:
+            if cached:
+                cached["drug_name"] = drug_name
+            return cached or None
+        
         try:
             # FDA Drug Labeling API
-            url = f"{self.fda_base_url}/drug/label.json"
-            params = {
-                "search": f"openfda.brand_name:{drug_name}",
-                "limit": 1
-            }
+            url = self._fda_search_prefix + quote_plus(self._fda_search_clause(drug_name))
             
-            print(f"[DEBUG] Querying FDA for drug info: {drug_name}", file=sys.stderr)
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            logger.debug("Querying FDA for drug info: %s", drug_name)
+            data = json_loads(self._fda_get(url, timeout=10))
             
-            if data.get("results") and len(data["results"]) > 0:
+            try:
                 result = data["results"][0]
-                openfda = result.get("openfda", {})
-                
-                # Safely extract brand_name - handle empty lists
-                brand_name_list = openfda.get("brand_name", [])
-                brand_name = brand_name_list[0] if brand_name_list else drug_name
-                
-                # Safely extract generic_name - handle empty lists
-                generic_name_list = openfda.get("generic_name", [])
-                generic_name = generic_name_list[0] if generic_name_list else ""
-                
-                # Extract key sections that contain interaction/contraindication info
-                contraindications = result.get("contraindications_and_usage", [])
-                warnings = result.get("warnings", [])
-                precautions = result.get("precautions", [])
-                drug_interactions_section = result.get("drug_interactions", [])
-                
-                fda_info = {
-                    "drug_name": drug_name,
-                    "brand_name": brand_name,
-                    "generic_name": generic_name,
-                    "warnings": warnings,
-                    "contraindications": contraindications,
-                    "precautions": precautions,
-                    "drug_interactions": drug_interactions_section,
-                    "source": "FDA"
-                }
-                
-                print(f"[DEBUG] FDA info retrieved for {drug_name}: has warnings={len(warnings)}, interactions={len(drug_interactions_section)}", file=sys.stderr)
+            except (KeyError, TypeError, IndexError):
+                result = None
+            
+            if result:
+                fda_info = self._build_fda_info(drug_name, result)
+                self.cache.cache_drug_data(_drug_cache_key("fda", drug_name), fda_info)
                 return fda_info
             
-            print(f"[DEBUG] No FDA results found for {drug_name}", file=sys.stderr)
+            logger.debug("No FDA results found for %s", drug_name)
+            self.cache.cache_drug_data(_drug_cache_key("fda", drug_name), {})
             return None
             
-        except Exception as e:
-            print(f"[DEBUG] Error getting FDA info for {drug_name}: {str(e)}", file=sys.stderr)
+        except CircuitBreakerError as e:
+            logger.debug("Skipping FDA lookup for %s: %s", drug_name, e)
+            return None
+        except (requests.RequestException, ValueError) as e:
+            logger.debug("Error getting FDA info for %s: %s", drug_name, e)
             return None
     
+    def get_fda_drug_info_bulk(self, drug_names: List[str]) -> Dict[str, Dict]:
+        """
+        Get FDA label information for several drugs with one OR'd openFDA search.
+        
+        The combined search uses the same per-name clause as get_fda_drug_info.
+        Results come back in relevance order, so the first label matching a
+        name is the one the single lookup would return. When the response
+        holds every match (not cut off by FDA_BULK_LIMIT), names without a
+        label are cached as such. Only names crowded out of a truncated
+        response fall back to get_fda_drug_info.
+        
+        Args:
+            drug_names: Names of the drugs
+        
+        Returns:
+            Dictionary mapping each drug name that has an FDA label to its information
+        """
+        found: Dict[str, Dict] = {}
+        pending: List[str] = []
+        for drug_name in dict.fromkeys(drug_names):
+            cached = self.cache.get_cached_drug_data(_drug_cache_key("fda", drug_name))
+            if cached is None:
+                pending.append(drug_name)
+            elif cached:
+                cached["drug_name"] = drug_name
+                found[drug_name] = cached
+        
+        resolved = set()
+        if len(pending) > 1:
+            try:
+                search = " OR ".join(self._fda_search_clause(name) for name in pending)
+                url = f"{self._fda_label_url}?limit={self.FDA_BULK_LIMIT}&search={quote_plus(search)}"
+                
+                logger.debug("Querying FDA for drug info: %s", pending)
+                data = json_loads(self._fda_get(url, timeout=15))
+                results = data.get("results", [])
+                total = data.get("meta", {}).get("results", {}).get("total")
+                if total is None:
+                    complete = len(results) < self.FDA_BULK_LIMIT
+                else:
+                    complete = total <= len(results)
+                
+                for drug_name in pending:
+                    tokens = _NAME_TOKEN_RE.findall(drug_name.lower())
+                    result = next((r for r in results if self._label_matches(tokens, r)), None)
+                    if result:
+                        fda_info = self._build_fda_info(drug_name, result)
+                        self.cache.cache_drug_data(_drug_cache_key("fda", drug_name), fda_info)
+                        found[drug_name] = fda_info
+                        resolved.add(drug_name)
+                    elif complete:
+                        # Every label matching this name would be in the response
+                        self.cache.cache_drug_data(_drug_cache_key("fda", drug_name), {})
+                        resolved.add(drug_name)
+                
+            except CircuitBreakerError as e:
+                logger.debug("Skipping bulk FDA lookup: %s", e)
+                return found
+            except (requests.RequestException, ValueError) as e:
+                logger.debug("Error getting bulk FDA info for %s: %s", pending, e)
+        
+        for drug_name in pending:
+            if drug_name not in resolved:
+                fda_info = self.get_fda_drug_info(drug_name)
+                if fda_info:
+                    found[drug_name] = fda_info
+        
+        return found
+    
     def search_drug_websites(self, drug_name: str) -> List[Dict]:
         """
         Perform web search for drug information using SerpAPI (RAG approach).
@@ -422,9 +978,11 @@ class DrugAPIClient:
             # Fallback if SerpAPI key is not configured
             return []
         
+        if GoogleSearch is None:
+            print(f"SerpAPI library not available. Install: pip install google-search-results")
+            return []
+        
         try:
-            from serpapi import GoogleSearch
-            
             params = {
                 "q": f"{drug_name} medication side effects interactions",
                 "api_key": Config.SERPAPI_KEY,
@@ -451,12 +1009,88 @@ class DrugAPIClient:
             
             return web_results
             
-        except ImportError:
-            print(f"SerpAPI library not available. Install: pip install google-search-results")
-            return []
         except Exception as e:
             print(f"Error searching drug websites for {drug_name}: {str(e)}")
             return []
+    
+    def search_drug_websites_many(self, search_terms: List[str]) -> List[List[Dict]]:
+        """
+        Run several web searches concurrently.
+        
+        Each SerpAPI search is a blocking HTTP call, so a small thread pool lets
+        a list of searches finish in about the time of the slowest one.
+        
+        Args:
+            search_terms: Drug names or search queries
+        
+        Returns:
+            One list of search results per search term, in the same order
+        """
+        if not search_terms or not Config.SERPAPI_KEY or GoogleSearch is None:
+            # Nothing to run concurrently - search_drug_websites returns [] without a key or library
+            return [[] for _ in search_terms]
+        
+        max_workers = min(Config.WEB_SEARCH_MAX_CONCURRENCY, len(search_terms))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.search_drug_websites, search_terms))
+
+
+def _normalize_one(med: str, api_client: DrugAPIClient) -> Dict:
+    """Normalize one medication name, falling back to the original name on failure."""
+    logger.debug("Normalizing medication: %s", med)
+    normalized_med = api_client.normalize_drug_name_rxnorm(med)
+    logger.debug("Result for %s: %s", med, normalized_med)
+    
+    if normalized_med:
+        return normalized_med
+    
+    # Fallback: use original name if normalization fails
+    return {
+        "original_name": med,
+        "normalized_name": med,
+        "source": "fallback"
+    }
+
+
+def _iter_normalized_with_index(medications: List[str], api_client: DrugAPIClient) -> Iterator[Tuple[int, Dict]]:
+    """
+    Normalize medications concurrently, yielding (input index, result) in completion order.
+    
+    RxNorm lookups are network-bound, so running them on a small thread pool
+    makes a batch take roughly as long as its slowest lookup instead of the
+    sum of all of them. The client's RxNorm rate limiter keeps the pool under
+    the API's request limit.
+    """
+    if not medications:
+        return
+    
+    max_workers = min(Config.RXNORM_MAX_CONCURRENCY, len(medications))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_normalize_one, med, api_client): i
+            for i, med in enumerate(medications)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def iter_normalized_medications(medications: List[str], api_client: DrugAPIClient) -> Iterator[Dict]:
+    """
+    Normalize medication names using RxNorm, yielding each result as soon as it resolves.
+    
+    Lets callers (e.g. prompt assembly) start working on the first medications
+    instead of waiting for the whole list. Results arrive in completion order,
+    not input order.
+    
+    Args:
+        medications: List of medication names (brand or common names)
+        api_client: DrugAPIClient instance
+    
+    Yields:
+        Normalized medication dictionaries
+    """
+    for _, normalized_med in _iter_normalized_with_index(medications, api_client):
+        yield normalized_med
 
 
 def normalize_medications(medications: List[str], api_client: DrugAPIClient) -> List[Dict]:
@@ -468,27 +1102,9 @@ def normalize_medications(medications: List[str], api_client: DrugAPIClient) ->
         api_client: DrugAPIClient instance
     
     Returns:
-        List of normalized medication dictionaries
+        List of normalized medication dictionaries, in the same order as medications
     """
-    import sys
-    normalized = []
-    
-    for med in medications:
-        print(f"[DEBUG] Normalizing medication: {med}", file=sys.stderr)
-        normalized_med = api_client.normalize_drug_name_rxnorm(med)
-        print(f"[DEBUG] Result for {med}: {normalized_med}", file=sys.stderr)
-        if normalized_med:
-            normalized.append(normalized_med)
-        else:
-            # Fallback: use original name if normalization fails
-            normalized.append({
-                "original_name": med,
-                "normalized_name": med,
-                "source": "fallback"
-            })
-        
-        # Rate limiting
-        time.sleep(0.5)
-    
+    normalized: List[Optional[Dict]] = [None] * len(medications)
+    for i, normalized_med in _iter_normalized_with_index(medications, api_client):
+        normalized[i] = normalized_med
     return normalized
-
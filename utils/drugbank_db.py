@@ -5,16 +5,48 @@ Creates and manages a SQLite database from DrugBank data for efficient
 querying of drug interactions, food interactions, and drug properties.
 """
 
+import queue
 import sqlite3
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 import sys
 from .drugbank_loader import DrugBankLoader
 
 
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so a drug name is matched literally (used with ESCAPE '\\')."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class DrugBankDatabase:
     """Manages DrugBank data in SQLite database."""
     
+    # Drugs per executemany batch during the initial load
+    BATCH_SIZE = 10000
+    
+    # Read connections shared by the query methods across request threads
+    POOL_SIZE = 5
+    
+    # Prepared statements kept per connection. The query methods use fixed SQL
+    # text (only the interaction matrix varies, by its number of IN
+    # placeholders), so repeat queries skip SQLite's parse and plan step.
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Entries kept per memoized lookup (drug by id, drug by name, food interactions)
+    LOOKUP_CACHE_SIZE = 4096
+    
+    # Common/brand names whose DrugBank entry is listed under a chemical name:
+    # alias -> prefix of the DrugBank name (stored in drug_aliases at build time)
+    COMMON_SYNONYMS = {
+        "aspirin": "acetylsalicylic",
+        "ibuprofen": "isobutylphenylpropionic",
+        "tylenol": "acetaminophen",
+        "paracetamol": "acetaminophen",
+    }
+    
     def __init__(self, db_file_path: str, xml_file_path: str = None):
         """
         Initialize database manager.
@@ -25,13 +57,31 @@ class DrugBankDatabase:
         """
         self.db_file_path = Path(db_file_path)
         self.xml_file_path = xml_file_path
-        self.conn = None
+        self.conn = None  # Write connection, used only while building the database
+        self._pool: Optional[queue.Queue] = None
+        self.has_fts = False
+        self.has_aliases = False
+        
+        # Rows never change once the database is built, so repeat lookups (the
+        # same medication checked for interactions, food and details across a
+        # chat session) are answered from memory
+        self._drug_by_id = lru_cache(maxsize=self.LOOKUP_CACHE_SIZE)(self._query_drug_by_id)
+        self._drug_by_name = lru_cache(maxsize=self.LOOKUP_CACHE_SIZE)(self._query_drug_by_name)
+        self._food_interactions = lru_cache(maxsize=self.LOOKUP_CACHE_SIZE)(self._query_food_interactions)
     
-    def initialize(self) -> bool:
+    def initialize(self, workers: int = 1) -> bool:
         """
         Initialize database from XML file.
         Creates tables and loads data.
         
+        The database is built in memory and then written to the database file
+        in one sequential pass with VACUUM INTO, so the file is never touched
+        by the bulk load and comes out compact, with each table and index on
+        contiguous pages.
+        
+        Args:
+            workers: Number of XML parser processes (see DrugBankLoader.iter_drugs)
+        
         Returns:
             True if successful, False otherwise
         """
@@ -44,20 +94,50 @@ class DrugBankDatabase:
             print(f"[INFO] Initializing DrugBank database from XML", file=sys.stderr)
             loader = DrugBankLoader(self.xml_file_path)
             
-            if not loader.load():
+            if not loader.xml_file_path.exists():
+                print(f"[ERROR] DrugBank XML file not found: {loader.xml_file_path}", file=sys.stderr)
                 return False
             
-            # Create database and tables
+            # Create database and tables in memory
+            self._clear_lookup_caches()
+            self.close()
+            self.conn = sqlite3.connect(":memory:")
+            self.conn.row_factory = sqlite3.Row
             self._create_tables()
             
-            # Load data from loader
-            self._load_drugs(loader)
+            # Skip the rollback journal for the bulk load - a failed build is
+            # simply recreated from the XML
+            self.conn.execute("PRAGMA journal_mode=OFF")
+            
+            # Stream drugs from the XML parser straight into the database,
+            # parsing on every core
+            self._load_drugs(loader.iter_drugs(workers=workers))
+            self._create_indexes()
+            
+            if self.has_fts:
+                self.conn.execute("INSERT INTO drugs_fts(drugs_fts) VALUES ('rebuild')")
+            self._seed_aliases()
+            self.conn.commit()
+            
+            # VACUUM INTO refuses to overwrite an existing database
+            print(f"[INFO] Writing database to {self.db_file_path}", file=sys.stderr)
+            self.db_file_path.unlink(missing_ok=True)
+            self.conn.execute("VACUUM INTO ?", (str(self.db_file_path),))
+            
+            # Build finished - serve queries from the read pool
+            self.conn.close()
+            self.conn = None
+            self._open_pool()
             
             print("[INFO] DrugBank database initialization complete", file=sys.stderr)
             return True
             
         except Exception as e:
             print(f"[ERROR] Failed to initialize database: {str(e)}", file=sys.stderr)
+            # Don't leave a half-built file behind to be picked up by connect()
+            self.close()
+            self.conn = None
+            self.db_file_path.unlink(missing_ok=True)
             return False
     
     def connect(self) -> bool:
@@ -72,8 +152,9 @@ class DrugBankDatabase:
                 print(f"[WARNING] Database file not found: {self.db_file_path}", file=sys.stderr)
                 return False
             
-            self.conn = sqlite3.connect(str(self.db_file_path))
-            self.conn.row_factory = sqlite3.Row
+            self._open_pool()
+            self.has_fts = self._has_table("drugs_fts")
+            self.has_aliases = self._has_table("drug_aliases")
             print(f"[INFO] Connected to DrugBank database", file=sys.stderr)
             return True
             
@@ -81,12 +162,61 @@ class DrugBankDatabase:
             print(f"[ERROR] Failed to connect to database: {str(e)}", file=sys.stderr)
             return False
     
-    def _create_tables(self):
-        """Create database schema."""
-        if self.conn is None:
-            self.conn = sqlite3.connect(str(self.db_file_path))
-            self.conn.row_factory = sqlite3.Row
+    def _has_table(self, name: str) -> bool:
+        """Check whether the connected database has a table (older builds lack newer ones)."""
+        with self._acquire() as conn:
+            return conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+            ).fetchone() is not None
+    
+    def _open_pool(self):
+        """Open POOL_SIZE configured connections to the database file."""
+        self._pool = queue.Queue()
+        for _ in range(self.POOL_SIZE):
+            conn = sqlite3.connect(
+                str(self.db_file_path),
+                check_same_thread=False,
+                cached_statements=self.STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            self._configure_connection(conn)
+            self._pool.put(conn)
+    
+    @contextmanager
+    def _acquire(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection from the pool for the duration of a with block.
+        
+        Each connection is used by one thread at a time; callers beyond
+        POOL_SIZE wait for a connection to be returned.
+        """
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """
+        Apply per-connection PRAGMAs for the read-mostly lookup workload.
+        
+        A large page cache and memory-mapped I/O keep hot pages of the drug
+        and interaction indexes resident between queries. The journal mode is
+        left at the default: WAL is a persistent property of the file and needs
+        writable -wal/-shm files next to it, which the prebuilt database
+        deployed to a read-only filesystem does not have.
         
+        Args:
+            conn: Connection to configure
+        """
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA busy_timeout=5000")
+    
+    def _create_tables(self):
+        """Create database schema on the build connection."""
         cursor = self.conn.cursor()
         
         # Drugs table
@@ -115,17 +245,6 @@ class DrugBankDatabase:
             )
         """)
         
-        # Create index for faster lookups
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_drug_interactions_drug_id 
-            ON drug_interactions(drug_id)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_drugs_name 
-            ON drugs(name COLLATE NOCASE)
-        """)
-        
         # Food interactions table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS food_interactions (
@@ -137,73 +256,154 @@ class DrugBankDatabase:
             )
         """)
         
+        # Alternative names resolved to a drug with one indexed lookup
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS drug_aliases (
+                alias TEXT PRIMARY KEY COLLATE NOCASE,
+                drug_id TEXT NOT NULL,
+                FOREIGN KEY (drug_id) REFERENCES drugs(id)
+            )
+        """)
+        self.has_aliases = True
+        
+        # Full-text index over drug names for word-boundary matches
+        # (populated after the load; skipped if SQLite lacks FTS5)
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS drugs_fts
+                USING fts5(name, content='drugs', content_rowid='rowid')
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            print("[WARNING] SQLite FTS5 unavailable, drug name search will use LIKE scans", file=sys.stderr)
+            self.has_fts = False
+        
+        self.conn.commit()
+        print("[INFO] Database tables created", file=sys.stderr)
+    
+    def _create_indexes(self):
+        """
+        Create the lookup indexes once the tables are loaded.
+        
+        Building an index from a full table is a single sorted pass, far
+        cheaper than updating every B-tree on each insert during the load.
+        """
+        cursor = self.conn.cursor()
+        
+        # Create index for faster lookups - (drug_id, interacting_drug_id) serves both
+        # per-drug lookups and point probes for a pair in the interaction matrix
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_di_pair 
+            ON drug_interactions(drug_id, interacting_drug_id)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_drugs_name 
+            ON drugs(name COLLATE NOCASE)
+        """)
+        
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_food_interactions_drug_id 
             ON food_interactions(drug_id)
         """)
         
         self.conn.commit()
-        print("[INFO] Database tables created", file=sys.stderr)
+        print("[INFO] Database indexes created", file=sys.stderr)
     
-    def _load_drugs(self, loader: DrugBankLoader):
+    def _load_drugs(self, drugs: Iterable[Dict]):
         """
-        Load drug data from loader into database.
+        Load drug data into database.
+        
+        Everything is written in one transaction. Drugs are taken from the
+        iterable BATCH_SIZE at a time and each table's rows are generated
+        straight into executemany, so no row lists are built.
         
         Args:
-            loader: DrugBankLoader instance with loaded data
+            drugs: Parsed drug dictionaries, e.g. from DrugBankLoader.iter_drugs()
         """
         cursor = self.conn.cursor()
         
-        drugs = loader.get_all_drugs()
-        print(f"[INFO] Loading {len(drugs)} drugs into database...", file=sys.stderr)
+        print(f"[INFO] Loading drugs into database...", file=sys.stderr)
         
-        for i, drug in enumerate(drugs):
-            try:
-                # Insert drug
-                cursor.execute("""
-                    INSERT OR REPLACE INTO drugs 
-                    (id, name, description, indication, mechanism_of_action, toxicity)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    drug["primary_id"],
-                    drug.get("name", ""),
-                    drug.get("description", ""),
-                    drug.get("indication", ""),
-                    drug.get("mechanism_of_action", ""),
-                    drug.get("toxicity", ""),
-                ))
-                
-                # Insert drug interactions
-                for interaction in drug.get("drug_interactions", []):
-                    cursor.execute("""
-                        INSERT INTO drug_interactions 
-                        (drug_id, interacting_drug_id, interacting_drug_name, description)
-                        VALUES (?, ?, ?, ?)
-                    """, (
-                        drug["primary_id"],
-                        interaction.get("drugbank_id", ""),
-                        interaction.get("name", ""),
-                        interaction.get("description", ""),
-                    ))
-                
-                # Insert food interactions
-                for food_interaction in drug.get("food_interactions", []):
-                    cursor.execute("""
-                        INSERT INTO food_interactions (drug_id, description)
-                        VALUES (?, ?)
-                    """, (drug["primary_id"], food_interaction))
-                
-                if (i + 1) % 5000 == 0:
-                    self.conn.commit()
-                    print(f"[INFO] Loaded {i + 1} drugs ({int((i+1)/len(drugs)*100)}%)...", file=sys.stderr)
-                    
-            except Exception as e:
-                print(f"[WARNING] Failed to load drug {drug.get('primary_id')}: {str(e)}", 
-                      file=sys.stderr)
+        named_drugs = self._named_drugs(drugs)
+        loaded = 0
+        
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            while True:
+                batch = list(islice(named_drugs, self.BATCH_SIZE))
+                if not batch:
+                    break
+                self._insert_batch(cursor, batch)
+                loaded += len(batch)
+                print(f"[INFO] Inserted {loaded} drugs...", file=sys.stderr)
+            
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
         
-        self.conn.commit()
         print(f"[INFO] All drugs loaded into database", file=sys.stderr)
     
+    def _named_drugs(self, drugs: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield the drugs that have a name (required by the drugs table), warning about the rest."""
+        for drug in drugs:
+            if drug.get("name"):
+                yield drug
+            else:
+                print(f"[WARNING] Skipping drug {drug['primary_id']} with no name", file=sys.stderr)
+    
+    def _seed_aliases(self):
+        """Resolve COMMON_SYNONYMS against the loaded drugs and store them in drug_aliases."""
+        for alias, name_prefix in self.COMMON_SYNONYMS.items():
+            self.conn.execute("""
+                INSERT OR REPLACE INTO drug_aliases (alias, drug_id)
+                SELECT ?, id FROM drugs WHERE name LIKE ? ESCAPE '\\' LIMIT 1
+            """, (alias, f"{_escape_like(name_prefix)}%"))
+    
+    def _insert_batch(self, cursor: sqlite3.Cursor, batch: List[Dict]):
+        """
+        Insert a batch of drugs with their drug and food interactions.
+        
+        Args:
+            cursor: Cursor inside the load transaction
+            batch: Parsed drug dictionaries, all with a name
+        """
+        cursor.executemany("""
+            INSERT OR REPLACE INTO drugs 
+            (id, name, description, indication, mechanism_of_action, toxicity)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            (
+                drug["primary_id"],
+                drug["name"],
+                drug.get("description"),
+                drug.get("indication"),
+                drug.get("mechanism_of_action"),
+                drug.get("toxicity"),
+            )
+            for drug in batch
+        ))
+        cursor.executemany("""
+            INSERT INTO drug_interactions 
+            (drug_id, interacting_drug_id, interacting_drug_name, description)
+            VALUES (?, ?, ?, ?)
+        """, (
+            (drug["primary_id"], interacting_id, interacting_name, description)
+            for drug in batch
+            for interacting_id, interacting_name, description in drug.get("drug_interactions", ())
+            if interacting_id
+        ))
+        cursor.executemany("""
+            INSERT INTO food_interactions (drug_id, description)
+            VALUES (?, ?)
+        """, (
+            (drug["primary_id"], food_interaction)
+            for drug in batch
+            for food_interaction in drug.get("food_interactions", ())
+        ))
+    
     def get_drug_by_id(self, drug_id: str) -> Optional[Dict]:
         """
         Get drug by DrugBank ID.
@@ -214,10 +414,15 @@ class DrugBankDatabase:
         Returns:
             Drug data dictionary or None
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM drugs WHERE id = ?", (drug_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        drug = self._drug_by_id(drug_id)
+        return dict(drug) if drug else None
+    
+    def _query_drug_by_id(self, drug_id: str) -> Optional[Dict]:
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM drugs WHERE id = ?", (drug_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     def get_drug_by_name(self, drug_name: str) -> Optional[Dict]:
         """
@@ -229,10 +434,15 @@ class DrugBankDatabase:
         Returns:
             Drug data dictionary or None
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM drugs WHERE LOWER(name) = LOWER(?)", (drug_name,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        drug = self._drug_by_name(drug_name)
+        return dict(drug) if drug else None
+    
+    def _query_drug_by_name(self, drug_name: str) -> Optional[Dict]:
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM drugs WHERE name = ? COLLATE NOCASE", (drug_name,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     def search_drugs(self, search_term: str, limit: int = 10) -> List[Dict]:
         """
@@ -245,17 +455,18 @@ class DrugBankDatabase:
         Returns:
             List of matching drug dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM drugs WHERE LOWER(name) LIKE LOWER(?) LIMIT ?",
-            (f"%{search_term}%", limit)
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM drugs WHERE name LIKE ? ESCAPE '\\' LIMIT ?",
+                (f"%{_escape_like(search_term)}%", limit)
+            )
+            return [dict(row) for row in cursor]
     
     def get_drug_by_name_fuzzy(self, drug_name: str) -> Optional[Dict]:
         """
         Get drug by name with fuzzy matching fallback.
-        First tries exact match, then tries smart partial match if no exact match found.
+        First tries exact match and known aliases, then tries smart partial match if no exact match found.
         Prefers matches where the search term is a complete word in the drug name.
         
         Args:
@@ -269,55 +480,94 @@ class DrugBankDatabase:
         if drug:
             return drug
         
-        # Try partial match, but prioritize matches where search term is a word boundary
-        cursor = self.conn.cursor()
-        
-        # First try: search term at start of name (e.g., "aspirin" matches "Aspirin..." but not "Nitroaspirin")
-        cursor.execute(
-            "SELECT * FROM drugs WHERE LOWER(name) LIKE LOWER(?) LIMIT 1",
-            (f"{drug_name}%",)
-        )
-        result = cursor.fetchone()
-        if result:
-            return dict(result)
-        
-        # Second try: search term after space (word boundary)
-        cursor.execute(
-            "SELECT * FROM drugs WHERE LOWER(name) LIKE LOWER(?) LIMIT 1",
-            (f"% {drug_name}%",)
-        )
-        result = cursor.fetchone()
-        if result:
-            return dict(result)
-        
-        # Third try: generic/chemical name lookups (aspirin -> acetylsalicylic, ibuprofen -> isobutylphenyl)
-        common_synonyms = {
-            "aspirin": "acetylsalicylic",
-            "ibuprofen": "isobutylphenylpropionic",
-            "tylenol": "acetaminophen",
-            "paracetamol": "acetaminophen",
-        }
-        
-        if drug_name.lower() in common_synonyms:
-            synonym = common_synonyms[drug_name.lower()]
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Known alternative name (aspirin -> acetylsalicylic acid)
+            if self.has_aliases:
+                cursor.execute("""
+                    SELECT drugs.* FROM drug_aliases
+                    JOIN drugs ON drugs.id = drug_aliases.drug_id
+                    WHERE alias = ?
+                """, (drug_name,))
+                result = cursor.fetchone()
+                if result:
+                    return dict(result)
+            
+            # Try partial match, but prioritize matches where search term is a word boundary.
+            # LIKE is case-insensitive and a prefix pattern can use idx_drugs_name (NOCASE).
+            escaped = _escape_like(drug_name)
+            
+            # First try: search term at start of name (e.g., "aspirin" matches "Aspirin..." but not "Nitroaspirin")
+            cursor.execute(
+                "SELECT * FROM drugs WHERE name LIKE ? ESCAPE '\\' LIMIT 1",
+                (f"{escaped}%",)
+            )
+            result = cursor.fetchone()
+            if result:
+                return dict(result)
+            
+            # Second try: search term at the start of a later word
+            result = self._match_name_word(cursor, drug_name)
+            if result:
+                return dict(result)
+            
+            # Third try: generic/chemical name lookups, for databases built before drug_aliases
+            synonym = None if self.has_aliases else self.COMMON_SYNONYMS.get(drug_name.lower())
+            if synonym:
+                cursor.execute(
+                    "SELECT * FROM drugs WHERE name LIKE ? ESCAPE '\\' LIMIT 1",
+                    (f"{synonym}%",)
+                )
+                result = cursor.fetchone()
+                if result:
+                    return dict(result)
+            
+            # Finally: last resort - any partial match
             cursor.execute(
-                "SELECT * FROM drugs WHERE LOWER(name) LIKE LOWER(?) LIMIT 1",
-                (f"{synonym}%",)
+                "SELECT * FROM drugs WHERE name LIKE ? ESCAPE '\\' LIMIT 1",
+                (f"%{escaped}%",)
             )
             result = cursor.fetchone()
             if result:
                 return dict(result)
+            
+            return None
+    
+    def _match_name_word(self, cursor: sqlite3.Cursor, drug_name: str) -> Optional[sqlite3.Row]:
+        """
+        Find a drug with a word in its name starting with drug_name.
+        
+        Uses the drugs_fts index when the database has one, otherwise a LIKE
+        scan for the term after a space.
+        
+        Args:
+            cursor: Database cursor
+            drug_name: Drug name to search for
+            
+        Returns:
+            Matching row or None
+        """
+        if self.has_fts:
+            # Quoted phrase with a prefix match on its last token
+            phrase = '"' + drug_name.replace('"', '""') + '"*'
+            try:
+                cursor.execute("""
+                    SELECT drugs.* FROM drugs_fts
+                    JOIN drugs ON drugs.rowid = drugs_fts.rowid
+                    WHERE drugs_fts MATCH ?
+                    LIMIT 1
+                """, (phrase,))
+                return cursor.fetchone()
+            except sqlite3.OperationalError:
+                # Terms FTS cannot parse (e.g. only punctuation) fall through to LIKE
+                pass
         
-        # Finally: last resort - any partial match
         cursor.execute(
-            "SELECT * FROM drugs WHERE LOWER(name) LIKE LOWER(?) LIMIT 1",
-            (f"%{drug_name}%",)
+            "SELECT * FROM drugs WHERE name LIKE ? ESCAPE '\\' LIMIT 1",
+            (f"% {_escape_like(drug_name)}%",)
         )
-        result = cursor.fetchone()
-        if result:
-            return dict(result)
-        
-        return None
+        return cursor.fetchone()
     
     def get_drug_interactions(self, drug_id: str) -> List[Dict]:
         """
@@ -329,13 +579,14 @@ class DrugBankDatabase:
         Returns:
             List of interaction dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM drug_interactions 
-            WHERE drug_id = ?
-            ORDER BY interacting_drug_name
-        """, (drug_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM drug_interactions 
+                WHERE drug_id = ?
+                ORDER BY interacting_drug_name
+            """, (drug_id,))
+            return [dict(row) for row in cursor]
     
     def get_drug_interactions_by_name(self, drug_name: str) -> List[Dict]:
         """
@@ -362,13 +613,23 @@ class DrugBankDatabase:
         Returns:
             List of food interaction descriptions
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT description FROM food_interactions 
-            WHERE drug_id = ?
-            ORDER BY id
-        """, (drug_id,))
-        return [row["description"] for row in cursor.fetchall()]
+        return list(self._food_interactions(drug_id))
+    
+    def _query_food_interactions(self, drug_id: str) -> Tuple[str, ...]:
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT description FROM food_interactions 
+                WHERE drug_id = ?
+                ORDER BY id
+            """, (drug_id,))
+            return tuple(row[0] for row in cursor)
+    
+    def _clear_lookup_caches(self):
+        """Forget memoized lookups (the database is being rebuilt)."""
+        self._drug_by_id.cache_clear()
+        self._drug_by_name.cache_clear()
+        self._food_interactions.cache_clear()
     
     def get_food_interactions_by_name(self, drug_name: str) -> List[str]:
         """
@@ -393,35 +654,43 @@ class DrugBankDatabase:
             drug_ids: List of DrugBank IDs
             
         Returns:
-            List of interaction dictionaries between any pair
+            List of interaction dictionaries (drug_id, interacting_drug_id,
+            interacting_drug_name, description) between any pair
         """
-        cursor = self.conn.cursor()
+        if len(drug_ids) < 2:
+            return []
+        
+        # Fetch every interaction among the drugs in one query, then pick one
+        # row per pair - the drug_id -> other_id direction if it exists
+        placeholders = ",".join("?" * len(drug_ids))
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT drug_id, interacting_drug_id, interacting_drug_name, description
+                FROM drug_interactions 
+                WHERE drug_id IN ({placeholders}) AND interacting_drug_id IN ({placeholders})
+                ORDER BY id
+            """, (*drug_ids, *drug_ids))
+            
+            by_pair = {}
+            for row in cursor:
+                by_pair.setdefault((row[0], row[1]), row)
         
         interactions = []
         for i, drug_id in enumerate(drug_ids):
             for other_id in drug_ids[i+1:]:
-                # Check if drug_id has interaction with other_id
-                cursor.execute("""
-                    SELECT * FROM drug_interactions 
-                    WHERE drug_id = ? AND interacting_drug_id = ?
-                """, (drug_id, other_id))
-                
-                result = cursor.fetchone()
+                result = by_pair.get((drug_id, other_id)) or by_pair.get((other_id, drug_id))
                 if result:
                     interactions.append(dict(result))
-                else:
-                    # Check reverse direction
-                    cursor.execute("""
-                        SELECT * FROM drug_interactions 
-                        WHERE drug_id = ? AND interacting_drug_id = ?
-                    """, (other_id, drug_id))
-                    result = cursor.fetchone()
-                    if result:
-                        interactions.append(dict(result))
         
         return interactions
     
     def close(self):
-        """Close database connection."""
+        """Close database connections."""
         if self.conn:
             self.conn.close()
+            self.conn = None
+        if self._pool is not None:
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+            self._pool = None
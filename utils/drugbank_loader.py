@@ -5,17 +5,55 @@ Parses the DrugBank full database XML file and extracts drug information,
 interactions, and food interactions for use in the medication tracker.
 """
 
+import io
+import mmap
+import multiprocessing
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Iterator, List, Dict, Optional, Tuple, Union
 import sys
 from pathlib import Path
 
+# lxml (libxml2) parses the multi-GB DrugBank file several times faster than
+# ElementTree; it is only needed when building the database
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 
 class DrugBankLoader:
     """Loads and parses DrugBank XML database."""
     
     # XML namespace used in DrugBank files
     NAMESPACE = {"db": "http://www.drugbank.ca"}
+    DRUG_TAG = "{http://www.drugbank.ca}drug"
+    
+    # Child element tags, qualified with the DrugBank namespace
+    ID_TAG = "{http://www.drugbank.ca}drugbank-id"
+    NAME_TAG = "{http://www.drugbank.ca}name"
+    DESCRIPTION_TAG = "{http://www.drugbank.ca}description"
+    DRUG_INTERACTIONS_TAG = "{http://www.drugbank.ca}drug-interactions"
+    DRUG_INTERACTION_TAG = "{http://www.drugbank.ca}drug-interaction"
+    FOOD_INTERACTIONS_TAG = "{http://www.drugbank.ca}food-interactions"
+    FOOD_INTERACTION_TAG = "{http://www.drugbank.ca}food-interaction"
+    
+    # Optional free-text fields of a drug: child element tag -> dictionary key
+    TEXT_FIELDS = {
+        DESCRIPTION_TAG: "description",
+        "{http://www.drugbank.ca}indication": "indication",
+        "{http://www.drugbank.ca}mechanism-of-action": "mechanism_of_action",
+        "{http://www.drugbank.ca}toxicity": "toxicity",
+    }
+    
+    # Top-level drugs carry a type attribute; the <drug> references nested in
+    # pathways do not, so this byte pattern marks where each record starts
+    DRUG_START = b'<drug type="'
+    
+    # Drugs per shard handed to a worker process by iter_drugs(workers > 1)
+    DRUGS_PER_SHARD = 500
     
     def __init__(self, xml_file_path: str):
         """
@@ -31,7 +69,7 @@ class DrugBankLoader:
     
     def load(self) -> bool:
         """
-        Load and parse the DrugBank XML file.
+        Load and parse the DrugBank XML file into memory.
         
         Returns:
             True if successful, False otherwise
@@ -41,30 +79,17 @@ class DrugBankLoader:
             return False
         
         try:
-            print(f"[INFO] Loading DrugBank XML from {self.xml_file_path}", file=sys.stderr)
-            
-            # Parse XML - using iterparse for memory efficiency with large files
-            context = ET.iterparse(str(self.xml_file_path), events=("end",))
-            
             drug_count = 0
-            for event, elem in context:
-                if elem.tag == "{http://www.drugbank.ca}drug":
-                    drug_data = self._parse_drug(elem)
-                    if drug_data:
-                        primary_id = drug_data["primary_id"]
-                        self.drugs[primary_id] = drug_data
-                        
-                        # Index by name for lookup
-                        name = drug_data.get("name", "")
-                        if name:
-                            self.drug_name_index[name.lower()] = primary_id
-                        
-                        drug_count += 1
-                        if drug_count % 1000 == 0:
-                            print(f"[INFO] Loaded {drug_count} drugs...", file=sys.stderr)
-                    
-                    # Clear element to save memory
-                    elem.clear()
+            for drug_data in self.iter_drugs():
+                primary_id = drug_data["primary_id"]
+                self.drugs[primary_id] = drug_data
+                
+                # Index by name for lookup
+                name = drug_data.get("name", "")
+                if name:
+                    self.drug_name_index[name.lower()] = primary_id
+                
+                drug_count += 1
             
             self.loaded = True
             print(f"[INFO] Successfully loaded {drug_count} drugs from DrugBank", file=sys.stderr)
@@ -74,6 +99,127 @@ class DrugBankLoader:
             print(f"[ERROR] Failed to load DrugBank XML: {str(e)}", file=sys.stderr)
             return False
     
+    def iter_drugs(self, workers: int = 1) -> Iterator[Dict]:
+        """
+        Parse the DrugBank XML file, yielding one drug at a time.
+        
+        Only the drugs currently being parsed are held in memory, so callers
+        that stream the drugs elsewhere (e.g. into SQLite) never need the
+        whole database resident.
+        
+        With workers > 1 the file is split at drug boundaries into shards that
+        are parsed in separate processes; drugs are still yielded in file order.
+        
+        Args:
+            workers: Number of parser processes
+        
+        Yields:
+            Drug data dictionaries, as returned by _parse_drug
+        
+        Raises:
+            OSError, ET.ParseError: If the file cannot be read or parsed
+        """
+        print(f"[INFO] Loading DrugBank XML from {self.xml_file_path}", file=sys.stderr)
+        
+        shards = self._find_shards() if workers > 1 else []
+        if len(shards) > 1:
+            drugs = self._iter_drugs_parallel(shards, workers)
+        else:
+            drugs = self._iter_parsed(str(self.xml_file_path))
+        
+        drug_count = 0
+        for drug_data in drugs:
+            drug_count += 1
+            if drug_count % 1000 == 0:
+                print(f"[INFO] Loaded {drug_count} drugs...", file=sys.stderr)
+            yield drug_data
+    
+    def _iter_parsed(self, source: Union[str, IO[bytes]]) -> Iterator[Dict]:
+        """
+        Run iterparse over an XML source and yield each parsed drug.
+        
+        Args:
+            source: File path or binary file object containing DrugBank XML
+        
+        Yields:
+            Drug data dictionaries
+        """
+        # Parse XML - using iterparse for memory efficiency with large files
+        if lxml_etree is not None:
+            context = lxml_etree.iterparse(source, events=("end",), tag=self.DRUG_TAG, huge_tree=True)
+        else:
+            context = ET.iterparse(source, events=("end",))
+        
+        for event, elem in context:
+            if elem.tag == self.DRUG_TAG:
+                drug_data = self._parse_drug(elem)
+                
+                # Clear element to save memory
+                elem.clear()
+                if lxml_etree is not None:
+                    # Also drop the already-processed siblings still attached to the root
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                
+                if drug_data:
+                    yield drug_data
+    
+    def _find_shards(self) -> List[Tuple[int, int]]:
+        """
+        Split the XML file into byte ranges that each hold whole top-level drugs.
+        
+        Returns:
+            (start, end) byte offsets, in file order; empty if no drugs are found
+        """
+        with open(self.xml_file_path, "rb") as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = []
+                pos = mm.find(self.DRUG_START)
+                while pos != -1:
+                    offsets.append(pos)
+                    pos = mm.find(self.DRUG_START, pos + 1)
+                end = mm.rfind(b"</drugbank>")
+        
+        if not offsets or end < offsets[-1]:
+            return []
+        
+        starts = offsets[::self.DRUGS_PER_SHARD]
+        return list(zip(starts, starts[1:] + [end]))
+    
+    def _iter_drugs_parallel(self, shards: List[Tuple[int, int]], workers: int) -> Iterator[Dict]:
+        """
+        Parse shards in a process pool, yielding drugs in file order.
+        
+        Workers are spawned rather than forked, since the calling process may
+        already be running threads (e.g. connection prewarming, a threaded web
+        server). At most two shards per worker are in flight at a time, so
+        parsed drugs cannot pile up while the caller is still consuming earlier
+        shards.
+        
+        Args:
+            shards: Byte ranges from _find_shards
+            workers: Number of worker processes
+        
+        Yields:
+            Drug data dictionaries
+        """
+        path = str(self.xml_file_path)
+        remaining = iter(shards)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = deque(
+                pool.submit(_parse_shard, path, start, end)
+                for start, end in islice(remaining, 2 * workers)
+            )
+            while pending:
+                drugs = pending.popleft().result()
+                shard = next(remaining, None)
+                if shard is not None:
+                    pending.append(pool.submit(_parse_shard, path, *shard))
+                yield from drugs
+    
     def _parse_drug(self, drug_elem: ET.Element) -> Optional[Dict]:
         """
         Parse a single drug element from XML.
@@ -85,109 +231,121 @@ class DrugBankLoader:
             Dictionary with drug data or None
         """
         try:
-            # Get primary drugbank ID
             primary_id = None
-            for id_elem in drug_elem.findall("db:drugbank-id", self.NAMESPACE):
-                if id_elem.get("primary") == "true":
-                    primary_id = id_elem.text
-                    break
+            name = None
+            texts = {}
+            drug_interactions = []
+            food_interactions = []
+            
+            # One pass over the drug's children rather than a find() per field,
+            # each of which rescans the children from the start
+            for child in drug_elem:
+                tag = child.tag
+                if tag == self.ID_TAG:
+                    if primary_id is None and child.get("primary") == "true":
+                        primary_id = child.text
+                elif tag == self.NAME_TAG:
+                    if name is None:
+                        name = self._text(child)
+                elif tag in self.TEXT_FIELDS:
+                    texts.setdefault(self.TEXT_FIELDS[tag], self._text(child))
+                elif tag == self.DRUG_INTERACTIONS_TAG:
+                    drug_interactions = self._parse_drug_interactions(child)
+                elif tag == self.FOOD_INTERACTIONS_TAG:
+                    food_interactions = self._parse_food_interactions(child)
             
             if not primary_id:
                 return None
             
-            # Extract basic info
-            name = self._get_text(drug_elem, "db:name")
-            description = self._get_text(drug_elem, "db:description")
-            indication = self._get_text(drug_elem, "db:indication")
-            mechanism = self._get_text(drug_elem, "db:mechanism-of-action")
-            toxicity = self._get_text(drug_elem, "db:toxicity")
-            
-            # Extract interactions
-            drug_interactions = self._parse_drug_interactions(drug_elem)
-            food_interactions = self._parse_food_interactions(drug_elem)
-            
-            return {
-                "primary_id": primary_id,
-                "name": name,
-                "description": description,
-                "indication": indication,
-                "mechanism_of_action": mechanism,
-                "toxicity": toxicity,
+            # IDs and names recur as interaction targets across thousands of
+            # drugs, so share one string object per value
+            drug = {
+                "primary_id": sys.intern(primary_id),
                 "drug_interactions": drug_interactions,
                 "food_interactions": food_interactions,
             }
             
+            # Fields missing from the record are left out
+            if name:
+                drug["name"] = sys.intern(name)
+            for key, text in texts.items():
+                if text:
+                    drug[key] = text
+            
+            return drug
+            
         except Exception as e:
             print(f"[ERROR] Failed to parse drug: {str(e)}", file=sys.stderr)
             return None
     
-    def _parse_drug_interactions(self, drug_elem: ET.Element) -> List[Dict]:
+    def _parse_drug_interactions(self, interactions_elem: ET.Element) -> List[Tuple[Optional[str], str, Optional[str]]]:
         """
-        Extract drug-drug interactions from drug element.
+        Extract drug-drug interactions from a drug's <drug-interactions> element.
         
         Args:
-            drug_elem: XML element representing a drug
+            interactions_elem: XML element holding the drug's interactions
             
         Returns:
-            List of interaction dictionaries
+            List of (drugbank_id, name, description) tuples
         """
         interactions = []
         
-        interactions_elem = drug_elem.find("db:drug-interactions", self.NAMESPACE)
-        if interactions_elem is None:
-            return interactions
-        
-        for interaction_elem in interactions_elem.findall("db:drug-interaction", self.NAMESPACE):
-            interaction_id = self._get_text(interaction_elem, "db:drugbank-id")
-            interaction_name = self._get_text(interaction_elem, "db:name")
-            description = self._get_text(interaction_elem, "db:description")
+        for interaction_elem in interactions_elem:
+            if interaction_elem.tag != self.DRUG_INTERACTION_TAG:
+                continue
+            
+            interaction_id = interaction_name = description = None
+            for child in interaction_elem:
+                tag = child.tag
+                if tag == self.ID_TAG:
+                    interaction_id = interaction_id or self._text(child)
+                elif tag == self.NAME_TAG:
+                    interaction_name = interaction_name or self._text(child)
+                elif tag == self.DESCRIPTION_TAG:
+                    description = description or self._text(child)
             
             if interaction_name:
-                interactions.append({
-                    "drugbank_id": interaction_id,
-                    "name": interaction_name,
-                    "description": description,
-                })
+                interactions.append((
+                    sys.intern(interaction_id) if interaction_id else None,
+                    sys.intern(interaction_name),
+                    description,
+                ))
         
         return interactions
     
-    def _parse_food_interactions(self, drug_elem: ET.Element) -> List[str]:
+    def _parse_food_interactions(self, food_interactions_elem: ET.Element) -> List[str]:
         """
-        Extract food interactions from drug element.
+        Extract food interactions from a drug's <food-interactions> element.
         
         Args:
-            drug_elem: XML element representing a drug
+            food_interactions_elem: XML element holding the drug's food interactions
             
         Returns:
             List of food interaction descriptions
         """
         interactions = []
         
-        food_interactions_elem = drug_elem.find("db:food-interactions", self.NAMESPACE)
-        if food_interactions_elem is None:
-            return interactions
-        
-        for interaction_elem in food_interactions_elem.findall("db:food-interaction", self.NAMESPACE):
-            text = interaction_elem.text
-            if text:
-                interactions.append(text.strip())
+        for interaction_elem in food_interactions_elem:
+            if interaction_elem.tag == self.FOOD_INTERACTION_TAG:
+                text = interaction_elem.text
+                if text:
+                    interactions.append(text.strip())
         
         return interactions
     
-    def _get_text(self, elem: ET.Element, path: str) -> Optional[str]:
+    @staticmethod
+    def _text(elem: ET.Element) -> Optional[str]:
         """
-        Safely get text from XML element.
+        Safely get stripped text from XML element.
         
         Args:
             elem: XML element
-            path: XPath to child element
             
         Returns:
             Text content or None
         """
-        child = elem.find(path, self.NAMESPACE)
-        if child is not None and child.text:
-            return child.text.strip()
+        if elem.text:
+            return elem.text.strip()
         return None
     
     def get_drug_by_id(self, drugbank_id: str) -> Optional[Dict]:
@@ -244,3 +402,24 @@ class DrugBankLoader:
             List of all drug dictionaries
         """
         return list(self.drugs.values())
+
+
+def _parse_shard(xml_file_path: str, start: int, end: int) -> List[Dict]:
+    """
+    Parse the drugs in one byte range of a DrugBank XML file (runs in a worker process).
+    
+    Args:
+        xml_file_path: Path to the XML file
+        start: Offset of the first drug in the range
+        end: Offset just past the last drug in the range
+        
+    Returns:
+        List of drug data dictionaries
+    """
+    with open(xml_file_path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    
+    # Re-wrap the drugs in a root element that declares the DrugBank namespace
+    source = io.BytesIO(b'<drugbank xmlns="http://www.drugbank.ca">' + chunk + b"</drugbank>")
+    return list(DrugBankLoader(xml_file_path)._iter_parsed(source))
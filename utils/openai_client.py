@@ -2,21 +2,49 @@
 Shared OpenAI client initialization utility.
 Eliminates duplicate client setup code in agents.
 """
+import atexit
 import os
 import sys
+import threading
+from functools import lru_cache
+from typing import Optional
+import httpx
 from openai import OpenAI
 from config import Config
 
 
+# Shared HTTP client (singleton pattern) - every agent's OpenAI client sends
+# requests through one keep-alive pool, so the TLS connection to the API is
+# reused across agents and requests
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    """Get or create the shared HTTP client for OpenAI requests."""
+    global _http_client
+    # Checked again under the lock so concurrent first calls build only one pool
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    timeout=30.0,
+                    verify=True,
+                    proxies=None,  # Explicitly set to None
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=20),
+                )
+    return _http_client
+
+
 def initialize_openai_client(agent_name: str = "Agent") -> OpenAI:
     """
-    Initialize OpenAI client with robust error handling.
+    Get the shared OpenAI client, initializing it with robust error handling on first use.
     
     Handles both httpx custom client and fallback to basic initialization.
     Used by QueryInterpreter and ExplanationAgent to avoid code duplication.
+    Every agent receives the same client, so it is only constructed once per process.
     
     Args:
-        agent_name: Name of agent initializing client (for debug messages)
+        agent_name: Name of agent requesting the client (for debug messages)
     
     Returns:
         Initialized OpenAI client
@@ -27,30 +55,37 @@ def initialize_openai_client(agent_name: str = "Agent") -> OpenAI:
     if not Config.OPENAI_API_KEY:
         raise ValueError("OPENAI_API_KEY is not configured. Please set it in your environment variables.")
     
+    print(f"[DEBUG] Getting OpenAI client for {agent_name}...", file=sys.stderr)
+    return _build_client()
+
+
+@lru_cache(maxsize=1)
+def _build_client() -> OpenAI:
+    """
+    Construct the OpenAI client (cached - runs once unless it raises).
+    
+    Returns:
+        Initialized OpenAI client
+    
+    Raises:
+        ValueError: If both init methods fail
+    """
     try:
-        print(f"[DEBUG] Initializing OpenAI client in {agent_name}...", file=sys.stderr)
-        # Initialize OpenAI client - try with minimal config first
-        import httpx
-        
-        # Create a custom HTTP client without proxy
-        http_client = httpx.Client(
-            timeout=30.0,
-            verify=True,
-            proxies=None  # Explicitly set to None
-        )
-        
+        print(f"[DEBUG] Initializing OpenAI client...", file=sys.stderr)
+        # Initialize OpenAI client - try with minimal config first,
+        # on the shared HTTP client without proxy
         client = OpenAI(
             api_key=Config.OPENAI_API_KEY,
-            http_client=http_client
+            http_client=get_http_client()
         )
-        print(f"[DEBUG] OpenAI client in {agent_name} initialized successfully with custom http_client", file=sys.stderr)
+        print(f"[DEBUG] OpenAI client initialized successfully with custom http_client", file=sys.stderr)
         return client
     except Exception as e:
         print(f"[ERROR] Failed with custom http_client, trying basic init: {str(e)}", file=sys.stderr)
         try:
             # Fallback: try without http_client parameter
             client = OpenAI(api_key=Config.OPENAI_API_KEY)
-            print(f"[DEBUG] OpenAI client in {agent_name} initialized successfully with basic init", file=sys.stderr)
+            print(f"[DEBUG] OpenAI client initialized successfully with basic init", file=sys.stderr)
             return client
         except Exception as e2:
             print(f"[ERROR] Basic init also failed: {str(e2)}", file=sys.stderr)
@@ -59,6 +94,15 @@ def initialize_openai_client(agent_name: str = "Agent") -> OpenAI:
             raise ValueError(f"Failed to initialize OpenAI client: {str(e2)}")
 
 
+def _close_client():
+    """Close the shared client's connections at interpreter exit, if it was ever built."""
+    if _build_client.cache_info().currsize:
+        _build_client().close()
+
+
+atexit.register(_close_client)
+
+
 def cleanup_environment():
     """
     Clean up environment variables that might interfere with HTTP requests.
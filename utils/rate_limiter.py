@@ -0,0 +1,39 @@
+"""
+Thread-safe token-bucket rate limiter for outbound API calls.
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """Allows up to `rate` calls per second, with bursts of up to `burst` calls."""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the limiter with a full bucket.
+        
+        Args:
+            rate: Sustained calls per second
+            burst: Maximum number of calls allowed back-to-back
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call is allowed, then consume one token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            time.sleep(wait)
@@ -3,9 +3,20 @@ Session management utilities for user context.
 Stateless implementation for Vercel serverless deployment.
 User context is stored client-side (localStorage) and sent with each request.
 """
+from types import MappingProxyType
 from typing import Dict
 
 
+# Scalar fields of the default user context (read-only); the list fields are
+# created fresh on every call so callers can never share and mutate them
+_DEFAULT_USER_CONTEXT = MappingProxyType({
+    'age': None,
+    'sex': None,
+    'weight': None,
+    'height': None,
+})
+
+
 def get_default_user_context() -> Dict:
     """
     Get default empty user context.
@@ -14,14 +25,7 @@ def get_default_user_context() -> Dict:
     Returns:
         Dictionary with default empty user context structure
     """
-    return {
-        'age': None,
-        'sex': None,
-        'weight': None,
-        'height': None,
-        'medications': [],
-        'conditions': []
-    }
+    return {**_DEFAULT_USER_CONTEXT, 'medications': [], 'conditions': []}
 
 
 def merge_user_context(existing: Dict = None, updates: Dict = None) -> Dict:
@@ -38,10 +42,5 @@ def merge_user_context(existing: Dict = None, updates: Dict = None) -> Dict:
     """
     if existing is None:
         existing = get_default_user_context()
-    if updates is None:
-        updates = {}
     
-    context = existing.copy()
-    context.update(updates)
-    return context
-
+    return {**existing, **(updates or {})}
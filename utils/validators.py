@@ -1,8 +1,40 @@
 """
 Input validation utilities.
 """
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+AGE_MIN, AGE_MAX = 0, 150
+WEIGHT_MIN, WEIGHT_MAX = 0, 1000
+HEIGHT_MIN, HEIGHT_MAX = 0, 300
+LIST_TYPES = (list, tuple)
+
+EMPTY_QUERY_ERROR = "Query cannot be empty"
+QUERY_LENGTH_ERROR = "Query exceeds maximum length of {} characters"
+AGE_RANGE_ERROR = f"Age must be between {AGE_MIN} and {AGE_MAX}"
+AGE_TYPE_ERROR = "Age must be a valid number"
+WEIGHT_RANGE_ERROR = f"Weight must be between {WEIGHT_MIN} and {WEIGHT_MAX}"
+WEIGHT_TYPE_ERROR = "Weight must be a valid number"
+HEIGHT_RANGE_ERROR = f"Height must be between {HEIGHT_MIN} and {HEIGHT_MAX} cm"
+HEIGHT_TYPE_ERROR = "Height must be a valid number"
+MEDICATIONS_TYPE_ERROR = "Medications must be a list"
+CONDITIONS_TYPE_ERROR = "Conditions must be a list"
+
+# Shared result tuples, so the common paths return without allocating
+_OK: tuple[bool, None] = (True, None)
+_EMPTY_QUERY = (False, EMPTY_QUERY_ERROR)
+_AGE_RANGE = (False, AGE_RANGE_ERROR)
+_AGE_TYPE = (False, AGE_TYPE_ERROR)
+_WEIGHT_RANGE = (False, WEIGHT_RANGE_ERROR)
+_WEIGHT_TYPE = (False, WEIGHT_TYPE_ERROR)
+_HEIGHT_RANGE = (False, HEIGHT_RANGE_ERROR)
+_HEIGHT_TYPE = (False, HEIGHT_TYPE_ERROR)
+_MEDICATIONS_TYPE = (False, MEDICATIONS_TYPE_ERROR)
+_CONDITIONS_TYPE = (False, CONDITIONS_TYPE_ERROR)
+
+# Marks a list field that is absent, as opposed to explicitly null
+_MISSING = object()
+
 
 def validate_user_query(query: str, max_length: int = 500) -> tuple[bool, Optional[str]]:
     """
@@ -15,13 +47,22 @@ def validate_user_query(query: str, max_length: int = 500) -> tuple[bool, Option
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not query or not query.strip():
-        return False, "Query cannot be empty"
+    # Length first: it is O(1), so oversized pastes are rejected without being
+    # scanned. isspace() stops at the first non-whitespace character and,
+    # unlike strip(), allocates nothing.
+    if query and len(query) > max_length:
+        return _length_error(max_length)
     
-    if len(query) > max_length:
-        return False, f"Query exceeds maximum length of {max_length} characters"
+    if not query or query.isspace():
+        return _EMPTY_QUERY
     
-    return True, None
+    return _OK
+
+
+@lru_cache(maxsize=16)
+def _length_error(max_length: int) -> tuple[bool, str]:
+    # Formatted once per limit, so a flood of oversized queries allocates nothing
+    return False, QUERY_LENGTH_ERROR.format(max_length)
 
 
 def validate_user_context(context: Dict) -> tuple[bool, Optional[str]]:
@@ -34,37 +75,66 @@ def validate_user_context(context: Dict) -> tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if 'age' in context and context['age'] is not None:
-        try:
-            age = int(context['age'])
-            if age < 0 or age > 150:
-                return False, "Age must be between 0 and 150"
-        except (ValueError, TypeError):
-            return False, "Age must be a valid number"
+    if not context:
+        return _OK
     
-    if 'weight' in context and context['weight'] is not None:
-        try:
-            weight = float(context['weight'])
-            if weight < 0 or weight > 1000:
-                return False, "Weight must be between 0 and 1000"
-        except (ValueError, TypeError):
-            return False, "Weight must be a valid number"
+    return _validate_fields(
+        context.get('age'),
+        context.get('weight'),
+        context.get('height'),
+        context.get('medications', _MISSING),
+        context.get('conditions', _MISSING),
+    )
+
+
+def _validate_fields(age=None, weight=None, height=None,
+                     medications=_MISSING, conditions=_MISSING) -> tuple[bool, Optional[str]]:
+    """
+    Validate user context fields passed individually.
     
-    if 'height' in context and context['height'] is not None:
-        try:
-            height = float(context['height'])
-            if height < 0 or height > 300:
-                return False, "Height must be between 0 and 300 cm"
-        except (ValueError, TypeError):
-            return False, "Height must be a valid number"
+    Callers that already hold the fields can use this directly rather than
+    building a dict. Numeric fields may be None; list fields are only checked
+    when given, and then must be a list (or tuple).
     
-    if 'medications' in context:
-        if not isinstance(context['medications'], list):
-            return False, "Medications must be a list"
+    Returns:
+        Tuple of (is_valid, error_message) for the first invalid field
+    """
+    # JSON numbers arrive as int/float already and are range-checked as-is;
+    # other types go through coercion. Matching on exact type keeps bool (an
+    # int subclass) on the coercion path. Ranges are written as
+    # not (low <= x <= high) so NaN, which fails every comparison, is rejected.
+    if age is not None:
+        if type(age) is not int:
+            try:
+                age = int(age)
+            except (ValueError, TypeError, OverflowError):
+                return _AGE_TYPE
+        if not AGE_MIN <= age <= AGE_MAX:
+            return _AGE_RANGE
     
-    if 'conditions' in context:
-        if not isinstance(context['conditions'], list):
-            return False, "Conditions must be a list"
+    if weight is not None:
+        if type(weight) not in (int, float):
+            try:
+                weight = float(weight)
+            except (ValueError, TypeError, OverflowError):
+                return _WEIGHT_TYPE
+        if not WEIGHT_MIN <= weight <= WEIGHT_MAX:
+            return _WEIGHT_RANGE
     
-    return True, None
-
+    if height is not None:
+        if type(height) not in (int, float):
+            try:
+                height = float(height)
+            except (ValueError, TypeError, OverflowError):
+                return _HEIGHT_TYPE
+        if not HEIGHT_MIN <= height <= HEIGHT_MAX:
+            return _HEIGHT_RANGE
+    
+    # Tuples are accepted as well so internal callers need not copy to a list
+    if medications is not _MISSING and not isinstance(medications, LIST_TYPES):
+        return _MEDICATIONS_TYPE
+    
+    if conditions is not _MISSING and not isinstance(conditions, LIST_TYPES):
+        return _CONDITIONS_TYPE
+    
+    return _OK